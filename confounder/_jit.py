@@ -0,0 +1,31 @@
+"""Optional Numba compilation for the numeric kernels."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+try:
+    from numba import njit as _njit
+except ImportError:  # pragma: no cover - optional accelerator
+    _njit = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+HAS_NUMBA = _njit is not None
+
+
+def jit(func: F) -> F:
+    """
+    Compile ``func`` with Numba when it is installed; otherwise return it unchanged.
+
+    Every kernel is compiled the same way: cached on disk, serial, and without
+    fastmath. The kernels run on worker threads (thread pools and
+    ``asyncio.to_thread``), where Numba's parallel backends are not safe to
+    launch. fastmath would let LLVM assume NaNs never occur and reorder
+    floating-point sums, so NaN scans could break and significance calls
+    could differ from the pure NumPy path.
+    """
+    if _njit is None:
+        return func
+    return cast(F, _njit(cache=True)(func))
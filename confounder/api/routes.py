@@ -2,17 +2,40 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
+import orjson
+import pandas as pd
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, ConfigDict
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-from confounder.config import LLMProvider, get_settings
+from confounder.config import ConfounderSettings, LLMProvider, get_settings
+from confounder.correction.explainer import BiasReport, generate_report
+from confounder.data.loader import Study
+from confounder.data.validator import ValidationResult, validate_study
+from confounder.detection.validator import validate_candidates
+from confounder.estimation.bias import estimate_biases
+from confounder.llm.adapter import LLMAdapter
+from confounder.llm.parser import ConfounderCandidate, parse_batched_candidates, parse_candidates
+from confounder.llm.prompts import (
+    SYSTEM_PROMPT,
+    format_batch_generation_prompt,
+    format_generation_prompt,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Confounder API"])
 
+MAX_BATCH_STUDIES = 64
+
+# Settings are fixed for the lifetime of the server process; bind them once
+# instead of going through get_settings() on every request.
+SETTINGS = get_settings()
+
 
 class ProvidersResponse(BaseModel):
     """Response containing available LLM providers."""
@@ -24,11 +47,10 @@ class ProvidersResponse(BaseModel):
 @router.get("/providers", response_model=ProvidersResponse)
 def get_providers() -> ProvidersResponse:
     """List all supported LLM providers and current configuration."""
-    settings = get_settings()
     return ProvidersResponse(
         providers=[p.value for p in LLMProvider],
-        active_provider=settings.llm_provider.value,
-        active_model=settings.resolved_model,
+        active_provider=SETTINGS.llm_provider.value,
+        active_model=SETTINGS.resolved_model,
     )
 
 
@@ -38,8 +60,15 @@ def get_providers() -> ProvidersResponse:
 # For this WhyNet-parity version, we stub the endpoint architecture.
 
 class CheckRequest(BaseModel):
-    """Request payload to check a dataset (JSON format)."""
-    dataset_records: list[dict[str, Any]]
+    """
+    Request payload to check a dataset (JSON format).
+
+    Send the data either row-wise as ``dataset_records`` or column-wise as
+    ``dataset_columns``. The columnar form maps straight onto a DataFrame
+    without per-row dict inference, so prefer it for large datasets.
+    """
+    dataset_records: list[dict[str, Any]] = Field(default_factory=list)
+    dataset_columns: dict[str, list[bool | int | float | str | None]] | None = None
     treatment: str
     outcome: str
     research_question: str
@@ -60,44 +89,53 @@ class CheckRequest(BaseModel):
          }
     )
 
-@router.post("/check")
-def check_study(request: CheckRequest) -> dict[str, Any]:
-    """
-    Run full Confounder analysis on a dataset provided via JSON.
-    """
-    import pandas as pd
-    from confounder.data.loader import Study
-    from confounder.data.validator import validate_study
-    from confounder.llm.adapter import LLMAdapter
-    from confounder.llm.prompts import SYSTEM_PROMPT, format_generation_prompt
-    from confounder.llm.parser import parse_candidates
-    from confounder.detection.validator import validate_candidates
-    from confounder.estimation.bias import estimate_bias
-    from confounder.correction.explainer import generate_report
-
-    if not request.dataset_records:
-        raise HTTPException(status_code=400, detail="dataset_records cannot be empty")
-        
-    df = pd.DataFrame(request.dataset_records)
-    
-    # Very basic Study assembly mimicking the loader
-    exclude = {"id", "index", "timestamp", "date", request.treatment, request.outcome}
-    covariates = [c for c in df.columns if c.lower() not in exclude]
-    
-    study = Study(
-        data=df,
+    @model_validator(mode="after")
+    def _check_dataset_shape(self) -> CheckRequest:
+        if self.dataset_columns is not None:
+            if self.dataset_records:
+                raise ValueError("Send either dataset_records or dataset_columns, not both")
+            if len({len(values) for values in self.dataset_columns.values()}) > 1:
+                raise ValueError("All dataset_columns must have the same length")
+        return self
+
+    @property
+    def is_empty(self) -> bool:
+        if self.dataset_columns is not None:
+            return not any(self.dataset_columns.values())
+        return not self.dataset_records
+
+
+def _build_study(request: CheckRequest) -> tuple[Study, ValidationResult]:
+    """Assemble and validate a Study from the request payload."""
+    if request.dataset_columns is not None:
+        df = pd.DataFrame(request.dataset_columns, copy=False)
+    else:
+        df = pd.DataFrame.from_records(request.dataset_records)
+    study = Study.from_dataframe(
+        df,
         treatment=request.treatment,
         outcome=request.outcome,
-        measured_covariates=covariates,
         research_question=request.research_question,
         background_context=request.context
     )
-    
-    val_res = validate_study(study, min_samples=request.min_samples)
-    if not val_res.is_valid:
-        raise HTTPException(status_code=400, detail={"errors": val_res.errors, "warnings": val_res.warnings})
+    return study, validate_study(study, min_samples=request.min_samples)
 
-    llm = LLMAdapter()
+
+def _run_analysis(study: Study, candidates: list[ConfounderCandidate]) -> BiasReport:
+    """CPU-bound validation, bias estimation and report generation."""
+    validated = validate_candidates(candidates, study)
+
+    results = estimate_biases(validated, study)
+    naive_est = results[0].naive_estimate if results else None
+
+    return generate_report(study, validated, naive_estimate=naive_est)
+
+
+async def _generate_candidates(
+    study: Study, settings: ConfounderSettings
+) -> list[ConfounderCandidate]:
+    """Ask the LLM for candidate confounders, mapping failures to HTTP errors."""
+    llm = LLMAdapter(settings)
     prompt = format_generation_prompt(
         research_question=study.research_question,
         treatment=study.treatment,
@@ -107,24 +145,111 @@ def check_study(request: CheckRequest) -> dict[str, Any]:
     )
 
     try:
-         # Note: For an API, this could take standard timeout/retry params or async
-         response = llm.complete(prompt, system=SYSTEM_PROMPT, format_json=True)
-         candidates = parse_candidates(response)
+         response = await asyncio.wait_for(
+             llm.acomplete(
+                 prompt,
+                 system=SYSTEM_PROMPT,
+                 format_json=True,
+                 max_tokens=settings.llm_max_output_tokens,
+                 cache_query=study.research_question,
+                 validate=parse_candidates,
+             ),
+             timeout=llm.total_timeout,
+         )
+         return parse_candidates(response)
+    except asyncio.TimeoutError:
+         raise HTTPException(
+             status_code=504, detail=f"LLM timed out after {llm.total_timeout:.0f}s"
+         )
     except Exception as e:
          raise HTTPException(status_code=502, detail=f"LLM failure: {e}")
 
-    validated = validate_candidates(candidates, study)
-    
-    naive_est = None
-    for v in validated:
-        if v.is_measured and v.is_statistically_significant:
-            res = estimate_bias(v, study)
-            if naive_est is None:
-                naive_est = res.naive_estimate
 
-    report = generate_report(study, validated, naive_estimate=naive_est)
+@router.post("/check")
+async def check_study(request: CheckRequest) -> dict[str, Any]:
+    """
+    Run full Confounder analysis on a dataset provided via JSON.
+
+    LLM I/O is awaited and the pandas/NumPy work runs in a worker
+    thread, so concurrent requests never block the event loop.
+    """
+    if request.is_empty:
+        raise HTTPException(status_code=400, detail="dataset cannot be empty")
+
+    study, val_res = await asyncio.to_thread(_build_study, request)
+    if not val_res.is_valid:
+        raise HTTPException(status_code=400, detail={"errors": val_res.errors, "warnings": val_res.warnings})
+
+    candidates = await _generate_candidates(study, SETTINGS)
+    report = await asyncio.to_thread(_run_analysis, study, candidates)
 
-    # Simplified serialization
+    return _serialize_report(report)
+
+
+def _sse(event: str, payload: dict[str, Any]) -> str:
+    """Format one Server-Sent Events message."""
+    data = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post("/check/stream")
+async def check_study_stream(request: CheckRequest) -> StreamingResponse:
+    """
+    Streaming variant of ``/check`` using Server-Sent Events.
+
+    The work is identical, but a ``phase`` event is emitted as each step
+    finishes (``validate``, ``llm_done``, ``bias_done``, ``report_done``) so
+    clients can render candidates while bias estimation is still running.
+    Failures after the stream has started arrive as a final ``error`` event
+    carrying the status code ``/check`` would have returned.
+    """
+    if request.is_empty:
+        raise HTTPException(status_code=400, detail="dataset cannot be empty")
+
+    async def event_generator() -> AsyncIterator[str]:
+        try:
+            study, val_res = await asyncio.to_thread(_build_study, request)
+            if not val_res.is_valid:
+                raise HTTPException(
+                    status_code=400,
+                    detail={"errors": val_res.errors, "warnings": val_res.warnings},
+                )
+            yield _sse("phase", {"phase": "validate", "warnings": val_res.warnings})
+
+            candidates = await _generate_candidates(study, SETTINGS)
+            yield _sse("phase", {
+                "phase": "llm_done",
+                "candidates": [c.name for c in candidates],
+            })
+
+            validated = await asyncio.to_thread(validate_candidates, candidates, study)
+            results = await asyncio.to_thread(estimate_biases, validated, study)
+            yield _sse("phase", {
+                "phase": "bias_done",
+                "biases": [
+                    {
+                        "name": v.candidate.name,
+                        "bias_magnitude": v.bias_magnitude,
+                        "bias_percentage": v.bias_percentage,
+                    }
+                    for v in validated
+                    if v.bias_magnitude is not None
+                ],
+            })
+
+            naive_est = results[0].naive_estimate if results else None
+            report = await asyncio.to_thread(
+                generate_report, study, validated, naive_estimate=naive_est
+            )
+            yield _sse("phase", {"phase": "report_done", "report": _serialize_report(report)})
+        except HTTPException as e:
+            yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+def _serialize_report(report: BiasReport) -> dict[str, Any]:
+    """Simplified JSON serialization of a BiasReport."""
     ranked_out = []
     for rc in report.ranked_confounders:
          v = rc.confounder
@@ -148,3 +273,79 @@ def check_study(request: CheckRequest) -> dict[str, Any]:
         "critical_confounders_found": report.has_critical_confounders,
         "ranked_confounders": ranked_out
     }
+
+
+async def _generate_batch_candidates(
+    llm: LLMAdapter,
+    settings: ConfounderSettings,
+    studies: list[Study],
+) -> list[list[ConfounderCandidate]]:
+    """One batched LLM round trip for a chunk of studies."""
+    response = await asyncio.wait_for(
+        llm.acomplete(
+            format_batch_generation_prompt(studies),
+            system=SYSTEM_PROMPT,
+            format_json=True,
+            # Every study in the prompt gets its own per-call output budget
+            max_tokens=settings.llm_max_output_tokens * len(studies),
+            validate=lambda reply: parse_batched_candidates(reply, len(studies)),
+        ),
+        timeout=llm.total_timeout,
+    )
+    return parse_batched_candidates(response, len(studies))
+
+
+@router.post("/check_batch")
+async def check_batch(requests: list[CheckRequest]) -> dict[str, Any]:
+    """
+    Run Confounder analysis on several datasets with a single LLM round trip.
+
+    Studies are folded into batched prompts of ``llm_batch_size`` each (so N
+    studies cost ceil(N / b) LLM calls, issued concurrently); the grouped
+    responses are fanned back out and each study is analysed concurrently.
+    """
+    if not requests:
+        raise HTTPException(status_code=400, detail="At least one study is required")
+    if len(requests) > MAX_BATCH_STUDIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_STUDIES} studies can be checked per batch",
+        )
+    for i, req in enumerate(requests):
+        if req.is_empty:
+            raise HTTPException(status_code=400, detail=f"Study {i}: dataset cannot be empty")
+
+    built = await asyncio.gather(*[asyncio.to_thread(_build_study, r) for r in requests])
+    for i, (_, val_res) in enumerate(built):
+        if not val_res.is_valid:
+            raise HTTPException(
+                status_code=400,
+                detail={"study": i, "errors": val_res.errors, "warnings": val_res.warnings},
+            )
+    studies = [study for study, _ in built]
+
+    llm = LLMAdapter(SETTINGS)
+    size = SETTINGS.llm_batch_size
+    chunks = [studies[i:i + size] for i in range(0, len(studies), size)]
+
+    try:
+         per_chunk = await asyncio.gather(*[
+             _generate_batch_candidates(llm, SETTINGS, chunk) for chunk in chunks
+         ])
+         grouped = [candidates for chunk in per_chunk for candidates in chunk]
+    except asyncio.TimeoutError:
+         raise HTTPException(
+             status_code=504, detail=f"LLM timed out after {llm.total_timeout:.0f}s"
+         )
+    except Exception as e:
+         raise HTTPException(status_code=502, detail=f"LLM failure: {e}")
+
+    reports = await asyncio.gather(*[
+        asyncio.to_thread(_run_analysis, study, candidates)
+        for study, candidates in zip(studies, grouped)
+    ])
+
+    return {
+        "status": "success",
+        "results": [_serialize_report(r) for r in reports],
+    }
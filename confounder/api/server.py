@@ -3,23 +3,80 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
+import numpy as np
+import orjson
+import pandas as pd
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from confounder import __version__
 from confounder.api.routes import router
+from confounder.data.loader import Study
+from confounder.data.validator import validate_study
+from confounder.detection.statistical import check_confounding_criteria
+from confounder.detection.validator import ValidatedConfounder
+from confounder.estimation.bias import estimate_bias
+from confounder.llm.parser import ConfounderCandidate
 
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, which also handles NumPy scalars/arrays natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _warm_up() -> None:
+    """
+    Run a tiny study through the hot paths before serving traffic.
+
+    The first real request would otherwise pay for the Numba compile (or
+    cache load) of the missingness and regression kernels.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "t": np.arange(16) % 2,
+        "y": rng.random(16),
+        "x": rng.random(16),
+    })
+    study = Study(data=df, treatment="t", outcome="y", measured_covariates=["x"],
+                  research_question="warm-up")
+    validate_study(study, min_samples=1)
+    confounder = ValidatedConfounder(
+        candidate=ConfounderCandidate("x", "", "", "", "low"),
+        is_measured=True,
+        matched_column="x",
+    )
+    estimate_bias(confounder, study)
+    # Binary treatment, so this also compiles the Logit kernel; both fits
+    # must run whatever the random data says, hence no early exit
+    check_confounding_criteria("x", "t", "y", [], df, early_exit=False)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Deliberately synchronous: startup should finish only once warm, and
+    # the JIT compile belongs on the main thread rather than a worker.
+    _warm_up()
+    logger.info("Warm-up complete")
+    yield
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
         title="Confounder API",
         description="Detect hidden confounders in observational studies.",
         version=__version__,
+        default_response_class=ORJSONResponse,
+        lifespan=_lifespan,
     )
 
     app.add_middleware(
@@ -12,7 +12,7 @@ from rich.panel import Panel
 from rich.table import Table
 
 from confounder import __version__
-from confounder.config import configure_logging
+from confounder.config import LLMProvider, configure_logging, get_settings
 
 app = typer.Typer(
     name="confounder",
@@ -45,7 +45,13 @@ def check(
     context: Optional[str] = typer.Option(None, "--context", "-c", help="Path to background domain doc (txt/md)"),
     min_samples: int = typer.Option(100, help="Minimum required sample size"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
-    show_graph: bool = typer.Option(False, "--graph", "-g", help="Open DAG visualization in browser")
+    show_graph: bool = typer.Option(
+        False, "--graph", "-g", help="Open DAG visualization in browser"
+    ),
+    workers: int = typer.Option(
+        0, "--workers", "-w", min=0,
+        help="Use N worker processes for bias estimation (0 or 1 uses threads)",
+    ),
 ) -> None:
     """Run full confounder audit: LLM Generation → Stats Validation → Bias Report."""
     configure_logging("DEBUG" if verbose else "INFO")
@@ -64,7 +70,7 @@ def check(
     console.print(f"   [dim]{study.n_samples} rows | Treatment: {treatment} | Outcome: {outcome}[/dim]")
 
     # 2. Validate Data
-    val_res = validate_study(study, min_samples=min_samples)
+    val_res = validate_study(study, min_samples=min_samples, early_exit=False)
     if not val_res.is_valid:
         for err in val_res.errors:
             console.print(f"❌ [red]{err}[/red]")
@@ -78,7 +84,8 @@ def check(
     from confounder.llm.parser import parse_candidates
 
     console.print("\n🧠 Querying LLM for candidate confounders based on domain knowledge...")
-    llm = LLMAdapter()
+    settings = get_settings()
+    llm = LLMAdapter(settings)
     prompt = format_generation_prompt(
         research_question=study.research_question,
         treatment=study.treatment,
@@ -88,7 +95,14 @@ def check(
     )
 
     try:
-         response = llm.complete(prompt, system=SYSTEM_PROMPT, format_json=True)
+         response = llm.complete(
+             prompt,
+             system=SYSTEM_PROMPT,
+             format_json=True,
+             max_tokens=settings.llm_max_output_tokens,
+             cache_query=study.research_question,
+             validate=parse_candidates,
+         )
          candidates = parse_candidates(response)
     except Exception as e:
          console.print(f"[red]LLM candidate generation failed: {e}[/red]")
@@ -105,20 +119,14 @@ def check(
     validated = validate_candidates(candidates, study)
 
     # 5. Bias Quantification
-    from confounder.estimation.bias import estimate_bias
-    from confounder.estimation.sensitivity import bound_unmeasured_confounder
+    from confounder.estimation.bias import estimate_biases
     
     console.print("🧮 Quantifying bias introduced by confirmed confounders...")
     
-    naive_est = None
-    for v in validated:
-        if v.is_measured and v.is_statistically_significant:
-            res = estimate_bias(v, study)
-            if naive_est is None:
-                naive_est = res.naive_estimate
-        elif not v.is_measured:
-             # Just bound it generally (stub if naive doesn't exist)
-             pass
+    results = estimate_biases(
+        validated, study, processes=workers > 1, max_workers=workers or None
+    )
+    naive_est = results[0].naive_estimate if results else None
 
     # 6. Report Generation
     from confounder.correction.explainer import generate_report
@@ -141,8 +149,6 @@ def check(
 @app.command()
 def providers() -> None:
     """Show available LLM providers and current config."""
-    from confounder.config import get_settings, LLMProvider
-
     settings = get_settings()
     table = Table(title="LLM Providers")
     table.add_column("Provider", style="cyan")
@@ -160,6 +166,8 @@ def providers() -> None:
 
 def _render_report(report) -> None:
     """Render the BiasReport to the console."""
+    from confounder.estimation.sensitivity import bound_unmeasured_confounder
+
     console.print("\n" + "="*50)
     console.print(f"=== [bold]Confounder Analysis Report[/bold] ===")
     console.print("="*50 + "\n")
@@ -192,7 +200,6 @@ def _render_report(report) -> None:
          console.print(f"              {cand.causes_outcome_because}")
          
          if not conf.is_measured:
-              from confounder.estimation.sensitivity import bound_unmeasured_confounder
               sens = bound_unmeasured_confounder(conf, report.study, report.naive_estimate or 0.0)
               console.print(f"   [dim]Estimated bias:[/dim] {sens.explanation}")
               console.print(f"   [dim]Evidence:[/dim] LLM mechanistic proposition (Severity: {cand.severity})")
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from enum import Enum
-from functools import lru_cache
+from functools import cache, lru_cache
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -53,6 +53,34 @@ class ConfounderSettings(BaseSettings):
     )
     llm_temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     llm_max_retries: int = Field(default=3, ge=1, le=10)
+    llm_timeout: float = Field(
+        default=60.0,
+        gt=0.0,
+        description="Seconds to wait for an LLM response before giving up",
+    )
+    llm_max_output_tokens: int = Field(
+        default=2048,
+        ge=1,
+        description="Upper bound on tokens generated per LLM call",
+    )
+    llm_batch_size: int = Field(
+        default=4,
+        ge=1,
+        le=16,
+        description="Studies folded into each batched candidate-generation prompt",
+    )
+
+    # ── LLM cache ───────────────────────────────────────────────
+    llm_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse stored LLM responses for identical prompts",
+    )
+    llm_cache_path: str = Field(default=".confounder_cache/llm.sqlite")
+    llm_cache_semantic: bool = Field(
+        default=False,
+        description="Also match near-identical research questions (needs sentence-transformers)",
+    )
+    llm_cache_similarity: float = Field(default=0.95, ge=0.0, le=1.0)
 
     # ── Statistics ──────────────────────────────────────────────
     alpha: float = Field(
@@ -75,10 +103,18 @@ class ConfounderSettings(BaseSettings):
     @property
     def resolved_model(self) -> str:
         """Return the LiteLLM model string."""
-        base = self.llm_model or _DEFAULT_MODELS.get(self.llm_provider, "llama3.1")
-        if self.llm_provider == LLMProvider.OLLAMA and "/" not in base:
-            return f"ollama/{base}"
-        return base
+        # Looked up from the current fields on every access, so it follows
+        # model_copy(update=...) and assignment; the string is built once per
+        # (provider, model) pair.
+        return _resolve_model(self.llm_provider, self.llm_model)
+
+
+@cache
+def _resolve_model(provider: LLMProvider, model: str) -> str:
+    base = model or _DEFAULT_MODELS.get(provider, "llama3.1")
+    if provider == LLMProvider.OLLAMA and "/" not in base:
+        base = f"ollama/{base}"
+    return base
 
 
 def configure_logging(level: str = "INFO") -> None:
@@ -5,6 +5,8 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 
+import numpy as np
+
 from confounder.data.loader import Study
 from confounder.detection.validator import ValidatedConfounder
 from confounder.correction.suggester import suggest_corrections, CorrectionStrategy
@@ -35,47 +37,41 @@ class BiasReport:
         return any(rc.severity == "Critical" for rc in self.ranked_confounders)
 
 
+_SEVERITY_BY_PRIORITY = {1: "Critical", 2: "Moderate", 3: "Moderate", 4: "Minor", 5: "Minor"}
+
+
 def rank_confounders(
     validated: list[ValidatedConfounder]
 ) -> list[RankedConfounder]:
     """Rank confounders by their bias magnitude or theoretical threat level."""
-    ranked = []
-    
-    for v in validated:
-        priority = 5
-        severity = "Minor"
-        
-        if v.is_measured and v.is_statistically_significant:
-            bias_pct = abs(v.bias_percentage or 0.0)
-            if bias_pct > 25.0:
-                priority = 1
-                severity = "Critical"
-            elif bias_pct > 10.0:
-                priority = 2
-                severity = "Moderate"
-            else:
-                priority = 4
-                severity = "Minor"
-        elif not v.is_measured:
-            # Unmeasured: rely on LLM severity
-            if v.candidate.severity.lower() == "high":
-                priority = 1
-                severity = "Critical"
-            elif v.candidate.severity.lower() == "medium":
-                priority = 3
-                severity = "Moderate"
-            else:
-                priority = 5
-                severity = "Minor"
-        else:
-             # Measured but not sig
-             continue
-             
-        ranked.append(RankedConfounder(confounder=v, severity=severity, priority=priority))
-        
-    # Sort by priority (1 is highest)
-    ranked.sort(key=lambda x: x.priority)
-    return ranked
+    # Measured but not significant confounders are not reported
+    kept = [v for v in validated if not v.is_measured or v.is_statistically_significant]
+    if not kept:
+        return []
+
+    n = len(kept)
+    is_measured = np.fromiter((v.is_measured for v in kept), dtype=bool, count=n)
+    bias_pct = np.abs(np.fromiter((v.bias_percentage or 0.0 for v in kept), dtype=float, count=n))
+    llm_severity = np.array([v.candidate.severity.lower() for v in kept])
+
+    # Measured & significant: rank by observed bias
+    measured_priority = np.select([bias_pct > 25.0, bias_pct > 10.0], [1, 2], default=4)
+    # Unmeasured: rely on LLM severity
+    unmeasured_priority = np.select(
+        [llm_severity == "high", llm_severity == "medium"], [1, 3], default=5
+    )
+    priority = np.where(is_measured, measured_priority, unmeasured_priority)
+
+    # Stable sort by priority (1 is highest) keeps input order within a tier
+    order = np.argsort(priority, kind="stable")
+    return [
+        RankedConfounder(
+            confounder=kept[i],
+            severity=_SEVERITY_BY_PRIORITY[int(priority[i])],
+            priority=int(priority[i]),
+        )
+        for i in order
+    ]
 
 
 def generate_report(
@@ -6,11 +6,16 @@ import logging
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
+# Lower-cased names of metadata columns that are never covariates.
+_EXCLUDE_META: frozenset[str] = frozenset({"id", "index", "timestamp", "date"})
+
+
 @dataclass
 class Study:
     """An observational study or experiment dataset."""
@@ -22,6 +27,28 @@ class Study:
     research_question: str
     background_context: str | None = None
 
+    @classmethod
+    def from_dataframe(
+        cls,
+        df: pd.DataFrame,
+        treatment: str,
+        outcome: str,
+        research_question: str,
+        background_context: str | None = None,
+    ) -> Study:
+        """Build a Study treating every non-metadata column as a measured covariate."""
+        # Drop any obvious metadata columns that shouldn't be covariates
+        core = (treatment, outcome)
+        covariates = [c for c in df.columns if c not in core and c.lower() not in _EXCLUDE_META]
+        return cls(
+            data=df,
+            treatment=treatment,
+            outcome=outcome,
+            measured_covariates=covariates,
+            research_question=research_question,
+            background_context=background_context,
+        )
+
     @property
     def n_samples(self) -> int:
         return len(self.data)
@@ -32,6 +59,70 @@ class Study:
         return self.data[available]
 
 
+@dataclass(frozen=True)
+class NumericFrame:
+    """
+    Float64 snapshot of a frame's numeric columns, plus their NaN mask.
+
+    Built once and shared by every regression in a validation or
+    estimation pass, so each fit is a boolean row mask and a column gather
+    on one contiguous array rather than a ``DataFrame.dropna`` copy. It is
+    a snapshot: build a fresh one if the underlying frame changes.
+    """
+
+    values: np.ndarray
+    col_index: dict[str, int]
+    nan_mask: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> NumericFrame:
+        numeric = df.select_dtypes(include=["number", "bool"])
+        values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(
+            values=values,
+            col_index={c: i for i, c in enumerate(numeric.columns)},
+            nan_mask=np.isnan(values),
+        )
+
+    def complete_rows(self, columns: list[str]) -> np.ndarray:
+        """``columns`` (in order) restricted to rows where none of them is NaN."""
+        idx = [self.col_index[c] for c in columns]
+        rows = ~self.nan_mask[:, idx].any(axis=1)
+        return self.values[np.ix_(rows, idx)]
+
+    def design(self, target: str, regressors: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        ``(y, [1, regressors])`` over the rows where none of the columns is NaN.
+
+        The design matrix is allocated once, intercept included, and each
+        column is gathered straight into it, rather than gathering a block
+        and then copying it again to prepend the ones column. It is
+        column-major, so every gather writes contiguous memory.
+        """
+        idx = [self.col_index[c] for c in [target, *regressors]]
+        rows = np.flatnonzero(~self.nan_mask[:, idx].any(axis=1))
+        y = self.values[rows, idx[0]]
+        X = np.empty((len(rows), len(regressors) + 1), order="F")
+        X[:, 0] = 1.0
+        for k, j in enumerate(idx[1:], start=1):
+            np.take(self.values[:, j], rows, out=X[:, k], mode="clip")
+        return y, X
+
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    """
+    Read a CSV with the multithreaded PyArrow parser when available.
+
+    Columns keep regular NumPy dtypes (no Arrow-backed dtypes) so the
+    NumPy/SciPy code downstream sees exactly what the C parser gives.
+    """
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except ImportError:
+        logger.debug("pyarrow not installed — falling back to the default CSV parser")
+        return pd.read_csv(path)
+
+
 def load_study(
     data_path: str | Path,
     treatment: str,
@@ -51,7 +142,7 @@ def load_study(
 
     # Load data
     logger.info("Loading dataset from %s", path.name)
-    df = pd.read_csv(path)
+    df = _read_csv(path)
     
     # Validate core columns
     if treatment not in df.columns:
@@ -59,11 +150,6 @@ def load_study(
     if outcome not in df.columns:
         raise ValueError(f"Outcome column '{outcome}' not found in data")
 
-    # Drop any obvious metadata columns that shouldn't be covariates
-    exclude = {"id", "index", "timestamp", "date", treatment, outcome}
-    covariates = [c for c in df.columns if c.lower() not in exclude]
-
-    logger.info("Loaded dataset: %d rows, %d standard covariates", len(df), len(covariates))
 
     # Load context if provided
     context_text = None
@@ -75,11 +161,13 @@ def load_study(
         else:
             logger.warning("Context file not found: %s", ctx_p)
 
-    return Study(
-        data=df,
+    study = Study.from_dataframe(
+        df,
         treatment=treatment,
         outcome=outcome,
-        measured_covariates=covariates,
         research_question=research_question,
         background_context=context_text,
     )
+    logger.info("Loaded dataset: %d rows, %d standard covariates",
+                study.n_samples, len(study.measured_covariates))
+    return study
@@ -6,12 +6,63 @@ import logging
 from dataclasses import dataclass
 
 import numpy as np
+import pandas as pd
 
+from confounder._jit import HAS_NUMBA, jit
 from confounder.data.loader import Study
 
 logger = logging.getLogger(__name__)
 
 
+def _nan_fractions_numpy(arr: np.ndarray) -> np.ndarray:
+    """Per-column NaN fraction of a 2-D float array."""
+    if arr.shape[0] == 0:
+        return np.zeros(arr.shape[1])
+    fractions: np.ndarray = np.isnan(arr).mean(axis=0)
+    return fractions
+
+
+if HAS_NUMBA:
+
+    @jit
+    def _nan_fractions(arr: np.ndarray) -> np.ndarray:
+        """Per-column NaN fraction in a single compiled pass per column."""
+        n, k = arr.shape
+        out = np.zeros(k)
+        if n == 0:
+            return out
+        for j in range(k):
+            c = 0
+            for i in range(n):
+                if np.isnan(arr[i, j]):
+                    c += 1
+            out[j] = c / n
+        return out
+
+else:
+    _nan_fractions = _nan_fractions_numpy
+
+
+def _covariate_null_fractions(df: pd.DataFrame, covariates: list[str]) -> pd.Series:
+    """
+    Fraction of missing values per covariate, in ``covariates`` order.
+
+    Numeric columns go through the (optionally Numba-compiled) array kernel;
+    anything else (strings, categoricals) falls back to ``isna``.
+    """
+    cov_frame = df[covariates]
+    numeric = cov_frame.select_dtypes(include="number")
+    fractions = pd.Series(
+        _nan_fractions(numeric.to_numpy(dtype=np.float64, na_value=np.nan)),
+        index=numeric.columns,
+        dtype=float,
+    )
+    other = [c for c in cov_frame.columns if c not in fractions.index]
+    if other:
+        fractions = pd.concat([fractions, cov_frame[other].isna().mean(axis=0)])
+    return fractions.reindex(cov_frame.columns)
+
+
 @dataclass
 class ValidationResult:
     """Result of data validation."""
@@ -21,9 +72,22 @@ class ValidationResult:
     warnings: list[str]
 
 
+def _result(errors: list[str], warnings: list[str]) -> ValidationResult:
+    is_valid = len(errors) == 0
+    if not is_valid:
+        logger.error("Study validation failed with %d errors", len(errors))
+    elif warnings:
+        logger.warning("Study validation passed with %d warnings", len(warnings))
+    else:
+        logger.info("Study validation passed.")
+
+    return ValidationResult(is_valid=is_valid, errors=errors, warnings=warnings)
+
+
 def validate_study(
     study: Study,
     min_samples: int = 100,
+    early_exit: bool = True,
 ) -> ValidationResult:
     """
     Validate that a dataset is suitable for causal inference.
@@ -33,6 +97,10 @@ def validate_study(
     - Variation in treatment
     - Variation in outcome
     - No NaN values in treatment/outcome
+
+    With ``early_exit`` the checks stop at the first fatal sample-size or
+    missing-core-column error, skipping the covariate scan; pass ``False``
+    to collect every error and warning for display.
     """
     errors = []
     warnings = []
@@ -46,41 +114,40 @@ def validate_study(
         errors.append(f"Insufficient samples: {len(df)} < {min_samples} required for reliable causal inference.")
     elif len(df) < min_samples * 2:
         warnings.append(f"Small sample size ({len(df)}). Causal estimates may have wide confidence intervals.")
+    if errors and early_exit:
+        return _result(errors, warnings)
 
-    # 2. Missing values in core columns
-    if df[t].isna().any():
+    # 2. Missing values in core columns (one vectorised scan for both)
+    core_missing = df[[t, y]].isna().any(axis=0)
+    t_missing, y_missing = bool(core_missing.iloc[0]), bool(core_missing.iloc[-1])
+    if t_missing:
         errors.append(f"Treatment column '{t}' contains missing values.")
-    if df[y].isna().any():
+    if y_missing:
         errors.append(f"Outcome column '{y}' contains missing values.")
+    if errors and early_exit:
+        return _result(errors, warnings)
 
     # 3. Variance in treatment
-    if not df[t].isna().any():
-        unique_t = df[t].nunique()
+    if not t_missing:
+        t_values = pd.unique(df[t].to_numpy())
+        unique_t = len(t_values)
         if unique_t < 2:
             errors.append(f"Treatment column '{t}' has no variation (only {unique_t} unique value).")
         # Is it binary or continuous?
-        if unique_t == 2 and not set(df[t].unique()) <= {0, 1, 0.0, 1.0, True, False}:
+        if unique_t == 2 and not set(t_values) <= {0, 1, 0.0, 1.0, True, False}:
              warnings.append(f"Treatment '{t}' is binary but not 0/1. Consider recoding for cleaner interpretation.")
              
     # 4. Variance in outcome
-    if not df[y].isna().any():
-        if df[y].nunique() < 2:
+    if not y_missing:
+        if len(pd.unique(df[y].to_numpy())) < 2:
             errors.append(f"Outcome column '{y}' has no variation.")
             
     # 5. Missing values in covariates
-    for cov in study.measured_covariates:
-        null_pct = df[cov].isna().mean()
+    null_pcts = _covariate_null_fractions(df, study.measured_covariates)
+    for cov, null_pct in null_pcts.items():
         if null_pct > 0.5:
             warnings.append(f"Covariate '{cov}' is missing in {null_pct:.0%} of rows.")
         elif null_pct > 0:
             warnings.append(f"Covariate '{cov}' has missing values. Statistical detection metrics may drop these rows.")
 
-    is_valid = len(errors) == 0
-    if not is_valid:
-        logger.error("Study validation failed with %d errors", len(errors))
-    elif warnings:
-        logger.warning("Study validation passed with %d warnings", len(warnings))
-    else:
-        logger.info("Study validation passed.")
-
-    return ValidationResult(is_valid=is_valid, errors=errors, warnings=warnings)
+    return _result(errors, warnings)
@@ -3,38 +3,210 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, NamedTuple
 
+import numpy as np
 import pandas as pd
-import statsmodels.api as sm
-from scipy import stats
+from scipy import linalg, special
+
+from confounder._jit import HAS_NUMBA, jit
+from confounder.data.loader import NumericFrame
 
 logger = logging.getLogger(__name__)
 
+# Newton-Raphson settings, matching statsmodels' Logit.fit() defaults
+_LOGIT_MAXITER = 35
+_LOGIT_TOL = 1e-8
+
+
+class RegressionFit(NamedTuple):
+    """The handful of regression statistics callers actually read, for one coefficient."""
+
+    coef: float
+    std_err: float
+    p_value: float
+    r_squared: float
+
+
+def with_intercept(block: np.ndarray) -> np.ndarray:
+    """``[1, block]`` as one preallocated float64 array (intercept first)."""
+    X = np.empty((block.shape[0], block.shape[1] + 1))
+    X[:, 0] = 1.0
+    X[:, 1:] = block
+    return X
+
+
+def _ols_core_numpy(X: np.ndarray, y: np.ndarray, idx: int) -> tuple[float, float, float]:
+    """(beta[idx], [(X'X)^-1][idx, idx], residual sum of squares) via Cholesky."""
+    factor = linalg.cho_factor(X.T @ X)
+    beta = linalg.cho_solve(factor, X.T @ y)
+    resid = y - X @ beta
+    unit = np.zeros(X.shape[1])
+    unit[idx] = 1.0
+    return float(beta[idx]), float(linalg.cho_solve(factor, unit)[idx]), float(resid @ resid)
+
+
+def _logit_core_numpy(
+    X: np.ndarray, y: np.ndarray, idx: int, maxiter: int, tol: float
+) -> tuple[float, float, float, bool]:
+    """
+    Logistic regression by Newton-Raphson (IRLS).
+
+    Returns (beta[idx], [H^-1][idx, idx], log-likelihood, converged).
+    Written with the NumPy subset Numba supports so it compiles as-is.
+    """
+    n, k = X.shape
+    beta = np.zeros(k)
+    converged = False
+    for _ in range(maxiter):
+        mu = 1.0 / (1.0 + np.exp(-(X @ beta)))
+        hessian = X.T @ (X * (mu * (1.0 - mu)).reshape(n, 1))
+        step = np.linalg.solve(hessian, X.T @ (y - mu))
+        beta = beta + step
+        if np.max(np.abs(step)) < tol:
+            converged = True
+            break
+
+    eta = X @ beta
+    mu = 1.0 / (1.0 + np.exp(-eta))
+    hessian = X.T @ (X * (mu * (1.0 - mu)).reshape(n, 1))
+    unit = np.zeros(k)
+    unit[idx] = 1.0
+    var_idx = np.linalg.solve(hessian, unit)[idx]
+    llf = np.sum(y * eta - np.logaddexp(0.0, eta))
+    return beta[idx], var_idx, llf, converged
+
+
+if HAS_NUMBA:
+
+    @jit
+    def _ols_core(X: np.ndarray, y: np.ndarray, idx: int) -> tuple[float, float, float]:
+        """Compiled OLS core: one LU solve for both beta and the idx-th column of (X'X)^-1."""
+        k = X.shape[1]
+        rhs = np.zeros((k, 2))
+        rhs[:, 0] = X.T @ y
+        rhs[idx, 1] = 1.0
+        sol = np.linalg.solve(X.T @ X, rhs)
+        resid = y - X @ sol[:, 0]
+        return sol[idx, 0], sol[idx, 1], resid @ resid
+
+    _logit_core = jit(_logit_core_numpy)
+
+else:
+    _ols_core = _ols_core_numpy
+    _logit_core = _logit_core_numpy
+
+
+def fast_ols(X: np.ndarray, y: np.ndarray, idx: int = 1) -> RegressionFit:
+    """
+    OLS on the normal equations, reporting coefficient ``idx``.
+
+    Equivalent to ``sm.OLS(y, X).fit()`` for full-rank designs, without
+    building a results object (SVD pseudo-inverse, full covariance, ...)
+    only to read one parameter. The solve is Numba-compiled when available.
+    Raises ``LinAlgError`` for singular designs.
+    """
+    n, k = X.shape
+    coef, var_idx, rss = _ols_core(X, y, idx)
+    dof = n - k
+    std_err = float(np.sqrt(rss / dof * var_idx))
+    p_value = float(2.0 * special.stdtr(dof, -abs(coef / std_err)))
+
+    centred = y - y.mean()
+    tss = float(centred @ centred)
+    r_squared = 1.0 - rss / tss if tss > 0 else 0.0
+    return RegressionFit(float(coef), std_err, p_value, r_squared)
+
+
+def fast_logit(X: np.ndarray, y: np.ndarray, idx: int = 1) -> RegressionFit:
+    """
+    Logistic regression for a 0/1 ``y``, reporting coefficient ``idx``.
+
+    Matches ``sm.Logit(y, X).fit()`` (Wald z-test, McFadden pseudo R^2).
+    The Newton-Raphson loop is Numba-compiled when available.
+    """
+    coef, var_idx, llf, converged = _logit_core(X, y, idx, _LOGIT_MAXITER, _LOGIT_TOL)
+    if not converged:
+        logger.debug("Logit did not converge in %d iterations", _LOGIT_MAXITER)
+
+    std_err = float(np.sqrt(var_idx))
+    p_value = float(2.0 * special.ndtr(-abs(coef / std_err)))
+
+    p0 = y.mean()
+    llnull = len(y) * (p0 * np.log(p0) + (1.0 - p0) * np.log(1.0 - p0)) if 0 < p0 < 1 else 0.0
+    r_squared = 1.0 - llf / llnull if llnull else 0.0
+    return RegressionFit(float(coef), std_err, p_value, float(r_squared))
+
+
+def check_associations_batched(
+    X: np.ndarray,
+    y: np.ndarray,
+    alpha: float = 0.05,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson test of every column of ``X`` against ``y`` in one pass.
+
+    Rows with a NaN in ``y`` or in any column of ``X`` are dropped, then the
+    correlations come from a single product of the centred, unit-norm
+    columns, with two-sided p-values from the Student t distribution.
+    Columns with no variance get a p-value of 1.0.
+    Returns (p_values, is_significant), one entry per column.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+
+    keep = ~(np.isnan(X).any(axis=1) | np.isnan(y))
+    X, y = X[keep], y[keep]
+    n = len(y)
+
+    p_values = np.ones(X.shape[1])
+    if n < 5:
+        return p_values, np.zeros(X.shape[1], dtype=bool)
+
+    Xc = X - X.mean(axis=0)
+    yc = y - y.mean()
+    x_norm = np.linalg.norm(Xc, axis=0)
+    y_norm = np.linalg.norm(yc)
+    valid = (x_norm > 0) & (y_norm > 0)
+
+    if valid.any():
+        r = (Xc[:, valid] / x_norm[valid]).T @ (yc / y_norm)
+        r = np.clip(r, -1.0, 1.0)
+        dof = n - 2
+        with np.errstate(divide="ignore"):
+            t = r * np.sqrt(dof / (1.0 - r**2))
+        p_values[valid] = 2.0 * special.stdtr(dof, -np.abs(t))
+
+    return p_values, p_values < alpha
+
+
+def _as_float_array(values: pd.Series | np.ndarray) -> np.ndarray:
+    """Float64 view of ``values`` where possible; pd.NA in nullable Series becomes NaN."""
+    if isinstance(values, pd.Series):
+        arr: np.ndarray = values.to_numpy(dtype=np.float64, na_value=np.nan, copy=False)
+        return arr
+    return np.asarray(values, dtype=np.float64)
+
 
 def check_association(
-    var_x: pd.Series,
-    var_y: pd.Series,
+    var_x: pd.Series | np.ndarray,
+    var_y: pd.Series | np.ndarray,
     alpha: float = 0.05,
 ) -> tuple[float, bool]:
     """
-    Test unconditional association between X and Y.
+    Test unconditional association between X and Y (Series or arrays).
     Returns (p_value, is_significant).
     """
     # Simple correlation test for continuous variables
     # (In a real system, we'd check types to use Chi-square for categorical)
-    
-    # Drop NaNs
-    mask = ~var_x.isna() & ~var_y.isna()
-    x_clean = var_x[mask]
-    y_clean = var_y[mask]
-
-    if len(x_clean) < 5:
-        return 1.0, False
-
     try:
-         r, p_val = stats.pearsonr(x_clean, y_clean)
-         return float(p_val), p_val < alpha
+         # NaNs (and pd.NA) are dropped by the batched test
+         x = _as_float_array(var_x)
+         y = _as_float_array(var_y)
+         p_values, significant = check_associations_batched(x, y, alpha)
+         return float(p_values[0]), bool(significant[0])
     except Exception as e:
          logger.warning("Association test failed: %s", e)
          return 1.0, False
@@ -44,51 +216,45 @@ def check_conditional_association(
     target: str,
     predictor: str,
     controls: list[str],
-    data: pd.DataFrame,
+    data: pd.DataFrame | NumericFrame,
     alpha: float = 0.05,
     is_binary_target: bool = False,
 ) -> tuple[float, bool, dict[str, Any]]:
     """
     Test association between predictor and target, controlling for covariates.
-    Uses OLS for continuous targets, Logit for binary targets.
+    Uses OLS (:func:`fast_ols`) for continuous targets, Logit (:func:`fast_logit`)
+    for binary targets. Pass a :class:`NumericFrame` when running many tests
+    on the same data to skip the per-call conversion.
     
     Returns (p_value, is_significant, regression_details).
     """
-    cols = [target, predictor] + controls
-    df = data[cols].dropna()
+    if isinstance(data, pd.DataFrame):
+        data = NumericFrame.from_frame(data)
 
-    if len(df) < len(cols) + 5:
-        return 1.0, False, {"error": "Insufficient data after dropping NaNs"}
+    try:
+        Y, X = data.design(target, [predictor] + controls)
+    except KeyError as e:
+        logger.warning("Conditional association test skipped: non-numeric column %s", e)
+        return 1.0, False, {"error": f"Non-numeric or missing column: {e}"}
 
-    Y = df[target]
-    
-    # Determine model type if not explicitly set
-    if is_binary_target or set(Y.unique()) <= {0, 1, 0.0, 1.0, True, False}:
-        model_class = sm.Logit
-        # Ensure Y is numeric 0/1 for statsmodels
-        Y = Y.astype(float)
-    else:
-        model_class = sm.OLS
+    if len(Y) < len(controls) + 7:
+        return 1.0, False, {"error": "Insufficient data after dropping NaNs"}
 
-    X = df[[predictor] + controls]
-    X = sm.add_constant(X)
+    # One vectorised pass; np.unique would sort the whole column first
+    is_binary = is_binary_target or not ((Y != 0.0) & (Y != 1.0)).any()
 
     try:
-        model = model_class(Y, X)
-        result = model.fit(disp=0)  # disp=0 suppresses convergence messages
-        
-        # Get p-value for the predictor
-        p_val = result.pvalues[predictor]
-        coef = result.params[predictor]
-        
+        fit_model = fast_logit if is_binary else fast_ols
+        fit = fit_model(X, Y)
+
         details = {
-            "coefficient": float(coef),
-            "std_err": float(result.bse[predictor]),
-            "model_type": "Logit" if model_class == sm.Logit else "OLS",
-            "r_squared": float(getattr(result, "rsquared", getattr(result, "prsquared", 0.0)))
+            "coefficient": fit.coef,
+            "std_err": fit.std_err,
+            "model_type": "Logit" if is_binary else "OLS",
+            "r_squared": fit.r_squared,
         }
         
-        return float(p_val), float(p_val) < alpha, details
+        return fit.p_value, fit.p_value < alpha, details
 
     except Exception as e:
         logger.warning("Conditional association test failed for %s ~ %s: %s", target, predictor, e)
@@ -100,14 +266,22 @@ def check_confounding_criteria(
     t_col: str,
     y_col: str,
     covariates: list[str],
-    data: pd.DataFrame,
+    data: pd.DataFrame | NumericFrame,
     alpha: float = 0.05,
+    early_exit: bool = True,
 ) -> dict[str, Any]:
     """
     Test the two structural criteria for Z being a measured confounder:
     1. Z causes T (Z is associated with T, possibly controlling for covariates)
     2. Z causes Y (Z is associated with Y, controlling for T and covariates)
+
+    Z is only a confounder if both hold, so with ``early_exit`` the Z -> Y
+    regression is skipped (``"causes_outcome": None``) once Z -> T fails.
+    Pass ``early_exit=False`` to always get both tests.
     """
+    if isinstance(data, pd.DataFrame):
+        data = NumericFrame.from_frame(data)
+
     # Test 1: Z -> T
     # Is Z associated with treatment (controlling for other covariates)?
     p_t, sig_t, det_t = check_conditional_association(
@@ -118,6 +292,17 @@ def check_confounding_criteria(
         alpha=alpha
     )
 
+    if early_exit and not sig_t:
+        return {
+            "is_statistical_confounder": False,
+            "causes_treatment": {
+                "p_value": p_t,
+                "is_significant": sig_t,
+                "details": det_t
+            },
+            "causes_outcome": None,
+        }
+
     # Test 2: Z -> Y
     # Is Z associated with outcome (controlling for treatment and other covariates)?
     p_y, sig_y, det_y = check_conditional_association(
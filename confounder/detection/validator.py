@@ -3,16 +3,43 @@
 from __future__ import annotations
 
 import logging
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
 
-from confounder.data.loader import Study
+from confounder.data.loader import NumericFrame, Study
 from confounder.detection.statistical import check_confounding_criteria
 from confounder.llm.parser import ConfounderCandidate
 
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # pragma: no cover - optional BLAS thread control
+    threadpool_limits = None
+
+process: ModuleType | None
+try:
+    from rapidfuzz import fuzz, process, utils
+except ImportError:  # pragma: no cover - optional fuzzy matcher
+    process = None
+
+# BLAS limits are process-wide, so overlapping validate_candidates calls (e.g.
+# concurrent API requests) share one limiter: the first caller in sets it and
+# the last one out restores the original limits.
+_blas_lock = threading.Lock()
+_blas_users = 0
+_blas_limiter: Any = None
+
+# Minimum rapidfuzz token-set score (0-100) for a fuzzy column match
+_FUZZY_CUTOFF = 80
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidatedConfounder:
     """A statistically or theoretically evaluated confounder."""
 
@@ -38,40 +65,95 @@ class ValidatedConfounder:
         return "measured_rejected"
 
 
+def lowercase_columns(columns: Iterable[str]) -> dict[str, str]:
+    """Lower-cased name → original column name (first one wins on clashes)."""
+    lower_cols: dict[str, str] = {}
+    for col in columns:
+        lower_cols.setdefault(col.lower(), col)
+    return lower_cols
+
+
 def match_candidate_to_column(
     candidate: ConfounderCandidate,
-    columns: list[str],
+    columns: Mapping[str, str] | list[str],
 ) -> str | None:
-    """Attempt to find the candidate variable in the dataset columns."""
+    """
+    Attempt to find the candidate variable in the dataset columns.
+
+    ``columns`` is ideally the :func:`lowercase_columns` map, built once and
+    shared across candidates; a plain list of names is converted here.
+    """
+    lower_cols = columns if isinstance(columns, Mapping) else lowercase_columns(columns)
     c_name = candidate.name.lower()
     
     # Exact match
-    if c_name in [col.lower() for col in columns]:
-        return next(col for col in columns if col.lower() == c_name)
+    if c_name in lower_cols:
+        return lower_cols[c_name]
         
-    # Partial match (e.g. "age" matches "user_age")
-    for col in columns:
-        if c_name in col.lower() or col.lower() in c_name:
-            if len(c_name) >= 3:  # avoid matching short strings like "id"
-                logger.info("Fuzzy matched LLM candidate '%s' to column '%s'", candidate.name, col)
-                return col
-                
-    return None
+    if len(c_name) < 3:  # avoid matching short strings like "id"
+        return None
+
+    # Fuzzy match (e.g. "age" matches "user_age", "studnet_age" matches "student_age")
+    if process is not None:
+        # Scored against the original names (the map's values); default_process
+        # lower-cases them and turns "_" into spaces, so names compare as word sets
+        best = process.extractOne(
+            c_name, lower_cols, scorer=fuzz.token_set_ratio,
+            processor=utils.default_process, score_cutoff=_FUZZY_CUTOFF,
+        )
+        matched = best[0] if best else None
+    else:
+        # Substring fallback without rapidfuzz
+        matched = next(
+            (col for lower, col in lower_cols.items() if c_name in lower or lower in c_name),
+            None,
+        )
+
+    if matched is not None:
+        logger.info("Fuzzy matched LLM candidate '%s' to column '%s'", candidate.name, matched)
+    return matched
+
+
+@contextmanager
+def _blas_single_threaded() -> Iterator[None]:
+    """Pin BLAS to one thread while candidates are fitted in parallel."""
+    global _blas_users, _blas_limiter
+    if threadpool_limits is None:
+        yield
+        return
+
+    with _blas_lock:
+        if _blas_users == 0:
+            _blas_limiter = threadpool_limits(limits=1, user_api="blas")
+        _blas_users += 1
+    try:
+        yield
+    finally:
+        with _blas_lock:
+            _blas_users -= 1
+            if _blas_users == 0:
+                _blas_limiter.restore_original_limits()
+                _blas_limiter = None
 
 
 def validate_candidates(
     candidates: list[ConfounderCandidate],
     study: Study,
     alpha: float = 0.05,
+    max_workers: int | None = None,
 ) -> list[ValidatedConfounder]:
     """
     Take LLM candidates and run statistical tests on them if they exist in the data.
+
+    The regressions for different measured candidates are independent, so
+    they run on a thread pool (the fits spend their time in NumPy/BLAS,
+    which releases the GIL). Output keeps the order of ``candidates``.
     """
-    validated = []
+    entries: list[ValidatedConfounder | tuple[ConfounderCandidate, str]] = []
     
     # We can check among covariates, but also check if the LLM hallucinated
     # and proposed the treatment/outcome themselves
-    available_cols = study.data.columns.tolist()
+    available_cols = lowercase_columns(study.data.columns)
 
     for cand in candidates:
         matched_col = match_candidate_to_column(cand, available_cols)
@@ -84,16 +166,20 @@ def validate_candidates(
         if not matched_col:
             # Unmeasured confounder
             logger.info("Candidate '%s' is UNMEASURED in this dataset.", cand.name)
-            validated.append(ValidatedConfounder(
+            entries.append(ValidatedConfounder(
                 candidate=cand,
                 is_measured=False,
                 matched_column=None,
             ))
             continue
 
-        # It's measured! Run statistical validation
+        # It's measured! Queue it for statistical validation
         logger.info("Candidate '%s' MATCHED to column '%s'. Running stats...", cand.name, matched_col)
-        
+        entries.append((cand, matched_col))
+
+    def run_stats(task: tuple[ConfounderCandidate, str]) -> ValidatedConfounder:
+        cand, matched_col = task
+
         # We test Z against T and Y, controlling for standard measured covariates (excluding Z itself)
         controls = [c for c in study.measured_covariates if c != matched_col]
         
@@ -102,26 +188,39 @@ def validate_candidates(
             t_col=study.treatment,
             y_col=study.outcome,
             covariates=controls,
-            data=study.data,
+            data=numeric,
             alpha=alpha
         )
         
         is_sig = stats["is_statistical_confounder"]
         p_t = stats["causes_treatment"]["p_value"]
-        p_y = stats["causes_outcome"]["p_value"]
+        # None when Z -> T already failed and the Z -> Y fit was skipped
+        outcome_test = stats["causes_outcome"]
+        p_y = outcome_test["p_value"] if outcome_test else None
         
         if is_sig:
              logger.info("✅ '%s' statistically CONFIRMED as a confounder! (p_T=%.3f, p_Y=%.3f)", matched_col, p_t, p_y)
         else:
              logger.info("❌ '%s' REJECTED by stats. Not a confounder in this data.", matched_col)
 
-        validated.append(ValidatedConfounder(
+        return ValidatedConfounder(
             candidate=cand,
             is_measured=True,
             matched_column=matched_col,
             causes_treatment_pval=p_t,
             causes_outcome_pval=p_y,
             is_statistically_significant=is_sig,
-        ))
+        )
+
+    tasks = [e for e in entries if isinstance(e, tuple)]
+    # One float64 snapshot shared by every regression in this pass
+    numeric = NumericFrame.from_frame(study.data) if tasks else None
+    if len(tasks) > 1:
+        # Parallelism is across candidates, so keep each fit's BLAS serial
+        # rather than oversubscribing cores with nested threads.
+        with _blas_single_threaded(), ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = iter(list(pool.map(run_stats, tasks)))
+    else:
+        results = iter([run_stats(t) for t in tasks])
 
-    return validated
+    return [next(results) if isinstance(e, tuple) else e for e in entries]
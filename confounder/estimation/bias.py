@@ -1,15 +1,15 @@
-"""Quantify the bias introduced by a confounder using statsmodels."""
+"""Quantify the bias introduced by a confounder via OLS adjustment."""
 
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 
 import pandas as pd
 import numpy as np
-import statsmodels.api as sm
 
-from confounder.data.loader import Study
+from confounder.data.loader import NumericFrame, Study
 from confounder.detection.validator import ValidatedConfounder
 
 logger = logging.getLogger(__name__)
@@ -27,33 +27,85 @@ class BiasEstimationResult:
 
 
 def _estimate_effect(
-    data: pd.DataFrame,
+    data: pd.DataFrame | NumericFrame,
     treatment: str,
     outcome: str,
     controls: list[str]
 ) -> float:
-    """Helper to estimate treatment effect using OLS."""
-    df = data.dropna(subset=[treatment, outcome] + controls)
-    if len(df) < len(controls) + 5:
+    """
+    Helper to estimate the OLS treatment effect of ``Y ~ 1 + T + controls``.
+
+    Uses Frisch-Waugh-Lovell: only T is residualised on ``[1, controls]``,
+    then the effect is ``rT.Y / rT.rT``. That is a k x k solve for k
+    controls (a scalar for the single-confounder case) instead of the full
+    (k+2)-column fit, and gives the identical coefficient.
+    """
+    if isinstance(data, pd.DataFrame):
+        data = NumericFrame.from_frame(data)
+    block = data.complete_rows([treatment, outcome] + controls)
+    if len(block) < len(controls) + 5:
         raise ValueError("Insufficient data for regression after dropping NaNs.")
-    
-    Y = df[outcome]
-    X = df[[treatment] + controls]
-    X = sm.add_constant(X)
-    
-    model = sm.OLS(Y, X)
-    result = model.fit(disp=0)
-    return float(result.params[treatment])
+
+    t = block[:, 0]
+    y = block[:, 1]
+    # Centring residualises on the intercept
+    r_t = t - t.mean()
+    if controls:
+        C = block[:, 2:]
+        C = C - C.mean(axis=0)
+        r_t = r_t - C @ np.linalg.solve(C.T @ C, C.T @ r_t)
+
+    ss_t = r_t @ r_t
+    if ss_t <= 1e-12 * len(t):
+        raise ValueError("Treatment has no variation left after adjusting for controls.")
+    # rT is orthogonal to [1, controls], so residualising Y as well changes nothing
+    return float(r_t @ y / ss_t)
+
+
+def naive_effect(study: Study, numeric: NumericFrame | None = None) -> float:
+    """
+    Unadjusted treatment effect (T -> Y with no controls).
+
+    It does not depend on the confounder, so callers estimating bias for
+    several confounders should compute it once and pass it to
+    :func:`estimate_bias`.
+    """
+    t_col = study.treatment
+    y_col = study.outcome
+    try:
+        return _estimate_effect(
+            study.data if numeric is None else numeric, t_col, y_col, []
+        )
+    except Exception as e:
+        logger.warning("Failed to compute naive effect using OLS: %s", e)
+        # Fallback to simple mean difference
+        T = study.data[t_col].to_numpy()
+        if not ((T == 0) | (T == 1)).all():
+            raise ValueError("Naive estimation failed on continuous treatment") from e
+        Y = study.data[y_col].to_numpy(dtype=float)
+        observed = ~np.isnan(Y)
+        groups = T[observed].astype(np.intp)
+        # Per-group sums and counts in one pass each, instead of two mask scans
+        sums = np.bincount(groups, weights=Y[observed], minlength=2)
+        counts = np.bincount(groups, minlength=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        return float(means[1] - means[0])
 
 
 def estimate_bias(
     confounder: ValidatedConfounder,
     study: Study,
     bias_threshold: float = 0.1,
+    naive_estimate: float | None = None,
+    numeric: NumericFrame | None = None,
 ) -> BiasEstimationResult:
     """
     Quantify how much a measured confounder biases the treatment effect.
     Uses OLS to estimate the naive effect vs the (partially) adjusted effect.
+    A precomputed ``naive_estimate`` (see :func:`naive_effect`) skips the
+    naive fit, and a shared ``numeric`` snapshot of ``study.data`` skips the
+    per-call conversion.
     """
     if not confounder.is_measured or not confounder.matched_column:
         raise ValueError("Cannot quantify precise bias for unmeasured confounders.")
@@ -64,22 +116,14 @@ def estimate_bias(
 
     # 1. Estimate Naive Effect (no controls)
     # Graph: T -> Y
-    try:
-        estimate_naive = _estimate_effect(study.data, t_col, y_col, [])
-    except Exception as e:
-        logger.warning("Failed to compute naive effect using OLS: %s", e)
-        # Fallback to simple mean difference
-        if set(study.data[t_col].unique()) <= {0, 1, 0.0, 1.0}:
-             t_0 = study.data[study.data[t_col] == 0][y_col].mean()
-             t_1 = study.data[study.data[t_col] == 1][y_col].mean()
-             estimate_naive = float(t_1 - t_0)
-        else:
-            raise ValueError("Naive estimation failed on continuous treatment") from e
+    if numeric is None:
+        numeric = NumericFrame.from_frame(study.data)
+    estimate_naive = naive_effect(study, numeric) if naive_estimate is None else naive_estimate
 
     # 2. Estimate Adjusted Effect (controlling for the confounder Z)
     # Graph: Z -> T, Z -> Y, T -> Y
     try:
-        estimate_adj = _estimate_effect(study.data, t_col, y_col, [z_col])
+        estimate_adj = _estimate_effect(numeric, t_col, y_col, [z_col])
     except Exception as e:
         logger.error("Failed to compute adjusted effect controlling for %s: %s", z_col, e)
         return BiasEstimationResult(estimate_naive, estimate_naive, 0.0, 0.0, False)
@@ -112,3 +156,81 @@ def estimate_bias(
         bias_percentage=float(bias_pct),
         is_problematic=is_prob,
     )
+
+
+# Per-process copy of the study, installed once by the pool initializer so
+# each task only has to pickle its (small) confounder.
+_WORKER_STUDY: Study | None = None
+_WORKER_NUMERIC: NumericFrame | None = None
+
+
+def _init_worker(study: Study) -> None:
+    global _WORKER_STUDY, _WORKER_NUMERIC
+    _WORKER_STUDY = study
+    _WORKER_NUMERIC = NumericFrame.from_frame(study.data)
+
+
+def _estimate_in_worker(
+    confounder: ValidatedConfounder, bias_threshold: float, naive_estimate: float
+) -> tuple[BiasEstimationResult, float | None, float | None]:
+    """Estimate in a worker; also return the bias fields it set on its copy (``None`` if not)."""
+    assert _WORKER_STUDY is not None, "worker pool was not initialised with a study"
+    result = estimate_bias(
+        confounder, _WORKER_STUDY, bias_threshold, naive_estimate, _WORKER_NUMERIC
+    )
+    return result, confounder.bias_magnitude, confounder.bias_percentage
+
+
+def estimate_biases(
+    confounders: list[ValidatedConfounder],
+    study: Study,
+    bias_threshold: float = 0.1,
+    max_workers: int | None = None,
+    processes: bool = False,
+) -> list[BiasEstimationResult]:
+    """
+    Run :func:`estimate_bias` for every measured, significant confounder in parallel.
+
+    Threads are the default since the OLS fits spend most of their time in
+    NumPy/BLAS, which releases the GIL. ``processes=True`` sidesteps the GIL
+    entirely; the study is shipped to each worker once at start-up rather
+    than with every task. Either way the bias is recorded on each confounder
+    in this process, and results keep input order. The naive effect is
+    shared by every confounder, so it is fitted once up front.
+    """
+    targets = [v for v in confounders if v.is_measured and v.is_statistically_significant]
+    if not targets:
+        return []
+
+    numeric = NumericFrame.from_frame(study.data)
+    naive = naive_effect(study, numeric)
+
+    if processes:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(study,)
+        ) as pool:
+            # Submit everything first, then collect, so the fits actually overlap.
+            worker_futures = [
+                pool.submit(_estimate_in_worker, v, bias_threshold, naive)
+                for v in targets
+            ]
+            outputs = [f.result() for f in worker_futures]
+
+        # Worker processes mutated their own copies; mirror what they set back
+        # here. A failed adjusted fit sets nothing, so the fields stay None,
+        # exactly as in the thread branch.
+        results = []
+        for v, (res, magnitude, percentage) in zip(targets, outputs):
+            if magnitude is not None:
+                v.bias_magnitude = magnitude
+            if percentage is not None:
+                v.bias_percentage = percentage
+            results.append(res)
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(estimate_bias, v, study, bias_threshold, naive, numeric)
+            for v in targets
+        ]
+        return [f.result() for f in futures]
@@ -2,14 +2,60 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from pathlib import Path
+from string import Template
 
 from confounder.data.loader import Study
 from confounder.correction.explainer import RankedConfounder
 
 logger = logging.getLogger(__name__)
 
+# (background, border) per severity; anything else renders gray.
+_SEVERITY_COLORS = {
+    "Critical": ("#FF851B", "#FF4136"),  # Orange
+    "Moderate": ("#FFDC00", "#FF851B"),  # Yellow
+}
+_DEFAULT_COLORS = ("#AAAAAA", "#777777")  # Gray
+
+# Self-contained vis-network page. Only the node/edge payloads vary per study,
+# so the page is filled in with a single substitution instead of being rebuilt.
+_DAG_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Causal Graph (Confounder Audit)</title>
+<script src="https://unpkg.com/vis-network@9.1.9/standalone/umd/vis-network.min.js"></script>
+<style>
+  body { margin: 0; background: #1E1E1E; color: white; font-family: sans-serif; }
+  h1 { text-align: center; }
+  #dag { width: 100%; height: 600px; }
+</style>
+</head>
+<body>
+<h1>Causal Graph (Confounder Audit)</h1>
+<div id="dag"></div>
+<script>
+  var nodes = new vis.DataSet($nodes);
+  var edges = new vis.DataSet($edges);
+  var options = {
+    layout: {hierarchical: {enabled: true, direction: "UD", sortMethod: "directed"}},
+    physics: {enabled: false},
+    nodes: {font: {color: "white"}},
+    edges: {arrows: {to: {enabled: true, scaleFactor: 1.0}}}
+  };
+  new vis.Network(document.getElementById("dag"), {nodes: nodes, edges: edges}, options);
+</script>
+</body>
+</html>
+""")
+
+
+def _to_js(payload: list[dict]) -> str:
+    # Escape "</" so labels cannot close the surrounding <script> block.
+    return json.dumps(payload).replace("</", "<\\/")
+
 
 def render_confounder_dag(
     study: Study,
@@ -17,107 +63,85 @@ def render_confounder_dag(
     output_path: str | Path = "confounder_dag.html",
 ) -> Path:
     """
-    Render an interactive DAG showing the treatment, outcome, and all 
+    Render an interactive DAG showing the treatment, outcome, and all
     detected/proposed confounders with severity coloring.
     """
-    try:
-        from pyvis.network import Network
-    except ImportError:
-        logger.warning("pyvis not installed — skipping DAG visualization")
-        return Path(output_path)
-
     output_path = Path(output_path)
-    net = Network(
-        height="600px",
-        width="100%",
-        directed=True,
-        bgcolor="#1E1E1E",  # dark mode by default
-        font_color="white",
-        heading="Causal Graph (Confounder Audit)",
-    )
 
     # Core nodes
-    net.add_node(
-        study.treatment,
-        label=f"Treatment: {study.treatment}",
-        color={"background": "#4a90d9", "border": "#007BFF"},
-        shape="box",
-        borderWidth=2,
-        level=2,
-    )
-    net.add_node(
-        study.outcome,
-        label=f"Outcome: {study.outcome}",
-        color={"background": "#e94560", "border": "#FF4136"},
-        shape="box",
-        borderWidth=2,
-        level=2,
-    )
-
+    nodes = [
+        {
+            "id": study.treatment,
+            "label": f"Treatment: {study.treatment}",
+            "color": {"background": "#4a90d9", "border": "#007BFF"},
+            "shape": "box",
+            "borderWidth": 2,
+            "level": 2,
+        },
+        {
+            "id": study.outcome,
+            "label": f"Outcome: {study.outcome}",
+            "color": {"background": "#e94560", "border": "#FF4136"},
+            "shape": "box",
+            "borderWidth": 2,
+            "level": 2,
+        },
+    ]
     # Core relationship
-    net.add_edge(study.treatment, study.outcome, color="#FFFFFF", width=2, title="Apparent Effect")
+    edges = [
+        {
+            "from": study.treatment,
+            "to": study.outcome,
+            "color": "#FFFFFF",
+            "width": 2,
+            "title": "Apparent Effect",
+        },
+    ]
 
-    # Add confounders
-    for i, rc in enumerate(ranked_confounders):
+    # Add confounders. vis.DataSet rejects duplicate ids (and then renders
+    # nothing), so a name repeated by the LLM, or one that clashes with the
+    # treatment/outcome, keeps only its first node.
+    seen = {study.treatment, study.outcome}
+    for rc in ranked_confounders:
         c_name = rc.confounder.candidate.name
-        
-        # Color by severity
-        if rc.severity == "Critical":
-            bg_color = "#FF851B" # Orange
-            border_color = "#FF4136"
-        elif rc.severity == "Moderate":
-            bg_color = "#FFDC00" # Yellow
-            border_color = "#FF851B"
-        else:
-            bg_color = "#AAAAAA" # Gray
-            border_color = "#777777"
-            
+        if c_name in seen:
+            logger.debug("Skipping duplicate DAG node '%s'", c_name)
+            continue
+        seen.add(c_name)
+        bg_color, border_color = _SEVERITY_COLORS.get(rc.severity, _DEFAULT_COLORS)
+
         label = f"{c_name}\n"
         if not rc.confounder.is_measured:
-             label += "(Unmeasured)"
+            label += "(Unmeasured)"
         elif rc.confounder.is_statistically_significant:
-             label += f"(Bias: {rc.confounder.bias_percentage:.1f}%)"
-             
-        net.add_node(
-            c_name,
-            label=label,
-            color={"background": bg_color, "border": border_color},
-            shape="ellipse",
-            borderWidth=2,
-            level=1, # Layer above treatment/outcome
-        )
-        
-        # Confounder paths
-        # Z -> T
-        net.add_edge(
-            c_name, study.treatment,
-            color=border_color,
-            width=2,
-            title=rc.confounder.candidate.causes_treatment_because
-        )
-        # Z -> Y
-        net.add_edge(
-            c_name, study.outcome,
-            color=border_color,
-            width=2,
-            title=rc.confounder.candidate.causes_outcome_because
-        )
-
-    # Physics layout
-    net.set_options("""
-    {
-        "layout": {
-            "hierarchical": {
-                "enabled": true,
-                "direction": "UD",
-                "sortMethod": "directed"
-            }
-        },
-        "physics": {"enabled": false},
-        "edges": {"arrows": {"to": {"enabled": true, "scaleFactor": 1.0}}}
-    }
-    """)
+            label += f"(Bias: {rc.confounder.bias_percentage:.1f}%)"
+
+        nodes.append({
+            "id": c_name,
+            "label": label,
+            "color": {"background": bg_color, "border": border_color},
+            "shape": "ellipse",
+            "borderWidth": 2,
+            "level": 1,  # Layer above treatment/outcome
+        })
+
+        # Confounder paths: Z -> T and Z -> Y
+        edges.append({
+            "from": c_name,
+            "to": study.treatment,
+            "color": border_color,
+            "width": 2,
+            "title": rc.confounder.candidate.causes_treatment_because,
+        })
+        edges.append({
+            "from": c_name,
+            "to": study.outcome,
+            "color": border_color,
+            "width": 2,
+            "title": rc.confounder.candidate.causes_outcome_because,
+        })
 
-    net.save_graph(str(output_path))
+    html = _DAG_TEMPLATE.substitute(nodes=_to_js(nodes), edges=_to_js(edges))
+    output_path.write_text(html, encoding="utf-8")
     logger.info("Saved Confounder DAG to %s", output_path)
     return output_path
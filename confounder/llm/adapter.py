@@ -2,84 +2,288 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
 import time
+from collections.abc import Callable
 from typing import Any
 
 import litellm
 
 from confounder.config import ConfounderSettings, get_settings
+from confounder.llm.cache import (
+    GenerativeCache,
+    get_generative_cache,
+    make_cache_key,
+    make_context_key,
+)
 
 logger = logging.getLogger(__name__)
 
+# Retry sleeps are drawn uniformly from [0, min(cap, base * 2**attempt)]
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 30.0
+
+
+def _backoff_ceiling(attempt: int) -> float:
+    """Longest sleep after failed ``attempt`` (1-based)."""
+    return float(min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+
 
 class ConfounderProviderError(Exception):
     """Raised when the LLM provider fails after all retries."""
 
 
 class LLMAdapter:
-    """Wrapper around LiteLLM with exponential backoff and transparent logging."""
+    """Wrapper around LiteLLM with jittered exponential backoff and transparent logging."""
 
     def __init__(self, settings: ConfounderSettings | None = None) -> None:
         self._settings = settings or get_settings()
         self._model = self._settings.resolved_model
+        self._cache: GenerativeCache | None = None
+        if self._settings.llm_cache_enabled:
+            try:
+                self._cache = get_generative_cache(
+                    self._settings.llm_cache_path,
+                    self._settings.llm_cache_semantic,
+                    self._settings.llm_cache_similarity,
+                )
+            except Exception as exc:
+                logger.warning("LLM cache unavailable, continuing without it: %s", exc)
         logger.info("LLMAdapter initialised → model=%s, provider=%s",
                      self._model, self._settings.llm_provider.value)
 
-    def complete(
+    @property
+    def total_timeout(self) -> float:
+        """
+        Worst-case seconds for one :meth:`complete` call, including every
+        retry and the backoff sleeps between them. Use this, not
+        ``llm_timeout``, when bounding a whole call from the outside.
+        """
+        retries = self._settings.llm_max_retries
+        backoff = sum(_backoff_ceiling(attempt) for attempt in range(1, retries))
+        return self._settings.llm_timeout * retries + backoff
+
+    def _build_call(
         self,
         prompt: str,
-        *,
-        system: str | None = None,
-        temperature: float | None = None,
-        max_tokens: int = 4096,
-        format_json: bool = False,
-        **kwargs: Any,
-    ) -> str:
-        """Send a prompt to the LLM with retry logic."""
+        system: str | None,
+        temperature: float | None,
+        max_tokens: int | None,
+        format_json: bool,
+        kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Assemble the litellm keyword arguments shared by sync and async calls."""
         messages: list[dict[str, str]] = []
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
 
-        temp = temperature if temperature is not None else self._settings.llm_temperature
-        max_retries = self._settings.llm_max_retries
-        
-        call_kwargs = {**kwargs}
+        if temperature is None:
+            temperature = self._settings.llm_temperature
+        if max_tokens is None:
+            max_tokens = self._settings.llm_max_output_tokens
+
+        call_kwargs = {
+            "model": self._model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "timeout": self._settings.llm_timeout,
+            **kwargs,
+        }
         if format_json:
             # Note: Not all providers support response_format strictly,
             # but LiteLLM handles translating this to the provider format.
             call_kwargs["response_format"] = {"type": "json_object"}
+        return call_kwargs
 
-        for attempt in range(1, max_retries + 1):
+    def _handle_success(self, response: Any) -> str:
+        content = response.choices[0].message.content or ""
+        tokens = getattr(response, "usage", None)
+        token_count = getattr(tokens, "total_tokens", 0) if tokens else 0
+        logger.info("LLM call succeeded → model=%s, tokens_used=%d",
+                   self._model, token_count)
+        return content
+
+    def _cache_key(
+        self, call_kwargs: dict[str, Any], prompt: str, system: str | None, use_cache: bool
+    ) -> str | None:
+        """Key for this call, or ``None`` when it should bypass the cache."""
+        if self._cache is None or not use_cache:
+            return None
+        return make_cache_key(self._model, prompt, system, call_kwargs["temperature"])
+
+    def _cache_context(
+        self, call_kwargs: dict[str, Any], prompt: str, system: str | None, cache_query: str | None
+    ) -> str | None:
+        """Context key that scopes semantic hits, or ``None`` without a ``cache_query``."""
+        if not cache_query:
+            return None
+        return make_context_key(
+            self._model, prompt, cache_query, system, call_kwargs["temperature"]
+        )
+
+    def _cache_lookup(
+        self, cache_key: str, cache_query: str | None, context: str | None
+    ) -> str | None:
+        assert self._cache is not None
+        # The cache is best-effort: a locked database or a failing encoder
+        # must not turn a perfectly good LLM call into an error.
+        try:
+            return self._cache.get(
+                cache_key, model=self._model, query=cache_query, context=context
+            )
+        except Exception as exc:
+            logger.warning("LLM cache lookup failed, calling the provider: %s", exc)
+            return None
+
+    def _cache_store(
+        self,
+        cache_key: str,
+        content: str,
+        cache_query: str | None,
+        context: str | None,
+        validate: Callable[[str], object] | None,
+    ) -> None:
+        assert self._cache is not None
+        if validate is not None:
             try:
-                response = litellm.completion(
-                    model=self._model,
-                    messages=messages,
-                    temperature=temp,
-                    max_tokens=max_tokens,
-                    **call_kwargs,
-                )
-                content = response.choices[0].message.content or ""
-                tokens = getattr(response, "usage", None)
-                token_count = getattr(tokens, "total_tokens", 0) if tokens else 0
-                logger.info("LLM call succeeded → model=%s, tokens_used=%d",
-                           self._model, token_count)
-                return content
+                validate(content)
+            except Exception as exc:
+                logger.warning("Not caching LLM response that failed validation: %s", exc)
+                return
+        try:
+            self._cache.set(
+                cache_key, content, model=self._model, query=cache_query, context=context
+            )
+        except Exception as exc:
+            logger.warning("Could not store LLM response in the cache: %s", exc)
 
+    def _backoff(self, attempt: int, max_retries: int, exc: Exception) -> float:
+        # Full jitter: concurrent callers that failed together retry at
+        # different times instead of hitting the provider in lockstep.
+        wait = random.uniform(0.0, _backoff_ceiling(attempt))
+        logger.warning(
+            "LLM call failed (attempt %d/%d): %s — retrying in %.1fs",
+            attempt, max_retries, exc, wait,
+        )
+        return wait
+
+    def _exhausted(self) -> ConfounderProviderError:
+        return ConfounderProviderError(
+            f"All {self._settings.llm_max_retries} LLM call attempts failed. "
+            f"Provider={self._settings.llm_provider.value}, model={self._model}."
+        )
+
+    def complete(
+        self,
+        prompt: str,
+        *,
+        system: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        format_json: bool = False,
+        cache_query: str | None = None,
+        validate: Callable[[str], object] | None = None,
+        use_cache: bool = True,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Send a prompt to the LLM with retry logic.
+
+        Each attempt is bounded by ``llm_timeout`` seconds and, unless
+        ``max_tokens`` is given, by ``llm_max_output_tokens``. When the LLM
+        cache is enabled, ``cache_query`` is the text used for semantic hits
+        and a response is only stored once ``validate`` (e.g. the candidate
+        parser) accepts it, so a malformed reply is never replayed. Pass
+        ``use_cache=False`` when a fresh sample is wanted (e.g. deliberately
+        re-rolling at a high temperature).
+        """
+        call_kwargs = self._build_call(prompt, system, temperature, max_tokens, format_json, kwargs)
+        cache_key = self._cache_key(call_kwargs, prompt, system, use_cache)
+        context = self._cache_context(call_kwargs, prompt, system, cache_query)
+        if cache_key is not None:
+            cached = self._cache_lookup(cache_key, cache_query, context)
+            if cached is not None:
+                return cached
+
+        max_retries = self._settings.llm_max_retries
+        for attempt in range(1, max_retries + 1):
+            try:
+                response = litellm.completion(**call_kwargs)
             except Exception as exc:
-                wait = 2 ** (attempt - 1)
-                logger.warning(
-                    "LLM call failed (attempt %d/%d): %s — retrying in %ds",
-                    attempt, max_retries, exc, wait,
-                )
+                wait = self._backoff(attempt, max_retries, exc)
                 if attempt < max_retries:
                     time.sleep(wait)
+                continue
 
-        raise ConfounderProviderError(
-            f"All {max_retries} LLM call attempts failed. "
-            f"Provider={self._settings.llm_provider.value}, model={self._model}."
-        )
+            content = self._handle_success(response)
+            if cache_key is not None:
+                self._cache_store(cache_key, content, cache_query, context, validate)
+            return content
+
+        raise self._exhausted()
+
+    async def acomplete(
+        self,
+        prompt: str,
+        *,
+        system: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        format_json: bool = False,
+        cache_query: str | None = None,
+        validate: Callable[[str], object] | None = None,
+        use_cache: bool = True,
+        **kwargs: Any,
+    ) -> str:
+        """Async variant of :meth:`complete` that does not block the event loop."""
+        call_kwargs = self._build_call(prompt, system, temperature, max_tokens, format_json, kwargs)
+        cache_key = self._cache_key(call_kwargs, prompt, system, use_cache)
+        context = self._cache_context(call_kwargs, prompt, system, cache_query)
+        if cache_key is not None:
+            # sqlite I/O and (semantic mode) embedding run off the event loop
+            cached = await asyncio.to_thread(self._cache_lookup, cache_key, cache_query, context)
+            if cached is not None:
+                return cached
+
+        max_retries = self._settings.llm_max_retries
+        timeout = self._settings.llm_timeout
+        for attempt in range(1, max_retries + 1):
+            try:
+                response = await asyncio.wait_for(
+                    litellm.acompletion(**call_kwargs), timeout=timeout
+                )
+            except Exception as exc:
+                wait = self._backoff(attempt, max_retries, exc)
+                if attempt < max_retries:
+                    await asyncio.sleep(wait)
+                continue
+
+            content = self._handle_success(response)
+            if cache_key is not None:
+                await asyncio.to_thread(
+                    self._cache_store, cache_key, content, cache_query, context, validate
+                )
+            return content
+
+        raise self._exhausted()
+
+    async def acomplete_many(self, prompts: list[str], **kwargs: Any) -> list[str]:
+        """Run :meth:`acomplete` for every prompt concurrently; results keep prompt order."""
+        return list(await asyncio.gather(*[self.acomplete(p, **kwargs) for p in prompts]))
+
+    def complete_many(self, prompts: list[str], **kwargs: Any) -> list[str]:
+        """
+        Blocking fan-out of several prompts (same options for each).
+
+        The calls overlap, so N prompts cost roughly one round trip rather
+        than N. Must not be called from a running event loop; await
+        :meth:`acomplete_many` there instead.
+        """
+        return asyncio.run(self.acomplete_many(prompts, **kwargs))
 
     @property
     def provider_info(self) -> dict[str, str]:
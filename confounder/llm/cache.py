@@ -0,0 +1,199 @@
+"""Persistent cache for LLM generations, with optional semantic lookup."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    query TEXT,
+    context TEXT,
+    embedding BLOB
+)
+"""
+
+_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def make_cache_key(
+    model: str,
+    prompt: str,
+    system: str | None = None,
+    temperature: float | None = None,
+) -> str:
+    """Stable cache key for a (system, prompt, model, temperature) combination."""
+    payload = "\x1f".join((system or "", prompt, model, repr(temperature)))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def make_context_key(
+    model: str,
+    prompt: str,
+    query: str,
+    system: str | None = None,
+    temperature: float | None = None,
+) -> str:
+    """
+    Key for everything in a call except ``query``.
+
+    Semantic hits are only allowed between calls with the same context key,
+    so a similar question never returns a reply generated for a different
+    study, system prompt or temperature.
+    """
+    return make_cache_key(model, prompt.replace(query, ""), system, temperature)
+
+
+class GenerativeCache:
+    """
+    SQLite-backed store of LLM responses.
+
+    Exact hits are looked up by :func:`make_cache_key`. When ``semantic`` is
+    enabled, misses fall back to a cosine-similarity search over embeddings of
+    the ``query`` text stored alongside each entry (e.g. the research
+    question), restricted to entries with the same ``context`` key (see
+    :func:`make_context_key`). Semantic lookup needs ``sentence-transformers``; without it the
+    cache silently degrades to exact matching.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        semantic: bool = False,
+        similarity_threshold: float = 0.95,
+    ) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._encoder: Any = None
+        self._semantic = semantic and self._load_encoder()
+
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(generations)")}
+            if "context" not in columns:
+                # Caches written before context keys existed never match semantically
+                conn.execute("ALTER TABLE generations ADD COLUMN context TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _load_encoder(self) -> bool:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            logger.warning("sentence-transformers not installed — semantic LLM cache disabled")
+            return False
+        try:
+            self._encoder = SentenceTransformer(_EMBEDDING_MODEL)
+        except Exception as exc:
+            logger.warning("Could not load %s — semantic LLM cache disabled: %s",
+                           _EMBEDDING_MODEL, exc)
+            return False
+        return True
+
+    def _embed(self, text: str) -> np.ndarray:
+        vec = np.asarray(self._encoder.encode(text), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def get(
+        self,
+        key: str,
+        *,
+        model: str,
+        query: str | None = None,
+        context: str | None = None,
+    ) -> str | None:
+        """Return a cached response for ``key``, or a semantically close one."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT response FROM generations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                logger.info("LLM cache hit (exact) → key=%s", key[:8])
+                return str(row[0])
+
+            if not (self._semantic and query and context):
+                return None
+
+            rows = conn.execute(
+                "SELECT response, embedding FROM generations "
+                "WHERE model = ? AND context = ? AND embedding IS NOT NULL",
+                (model, context),
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        target = self._embed(query)
+        matrix = np.stack([np.frombuffer(emb, dtype=np.float32) for _, emb in rows])
+        scores = matrix @ target
+        best = int(np.argmax(scores))
+        if scores[best] >= self._threshold:
+            logger.info("LLM cache hit (semantic, similarity=%.3f)", scores[best])
+            return str(rows[best][0])
+        return None
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        *,
+        model: str,
+        query: str | None = None,
+        context: str | None = None,
+    ) -> None:
+        """Store ``response`` under ``key``."""
+        embedding = None
+        if self._semantic and query and context:
+            embedding = self._embed(query).tobytes()
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO generations "
+                "(key, model, response, query, context, embedding) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, query, context, embedding),
+            )
+
+    def clear(self) -> None:
+        """Drop every cached generation."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM generations")
+
+
+@cache
+def get_generative_cache(
+    path: str,
+    semantic: bool = False,
+    similarity_threshold: float = 0.95,
+) -> GenerativeCache:
+    """
+    Shared cache per configuration.
+
+    Adapters are cheap and created per request; the cache (and, in semantic
+    mode, the embedding model) must not be, so it is built once and reused.
+    """
+    return GenerativeCache(path, semantic=semantic, similarity_threshold=similarity_threshold)
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import re
 from dataclasses import dataclass
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# A fenced block further into the reply, e.g. after a line of prose
+_FENCE_RE = re.compile(r"```(?:json)?[ \t]*\n(.*?)\n\s*```", re.DOTALL | re.IGNORECASE)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConfounderCandidate:
     """A proposed confounding variable from the LLM."""
 
@@ -35,39 +39,34 @@ class ConfounderCandidate:
         }
 
 
-def parse_candidates(llm_response: str) -> list[ConfounderCandidate]:
-    """
-    Parse the JSON response from the LLM into ConfounderCandidate objects.
-    Handles potential markdown code blocks wrapping the JSON.
-    """
+def _load_json(llm_response: str) -> object:
+    """Strip optional markdown fences and decode the LLM's JSON payload."""
     # 1. Clean markdown formatting if present
     cleaned = llm_response.strip()
     if cleaned.startswith("```"):
-        # Match ```json or just ```
-        match = re.search(r"```(?:json)?\s+([\s\S]*?)\s+```", cleaned)
-        if match:
-            cleaned = match.group(1)
-        else:
-             # Fallback: strip leading/trailing ticks
-             cleaned = cleaned.strip("`").strip()
+        # Drop the opening fence line (```json or just ```) and the closing
+        # fence with plain string scans; no regex backtracking on long replies
+        newline = cleaned.find("\n")
+        cleaned = cleaned[newline + 1:] if newline != -1 else cleaned[3:]
+        closing = cleaned.rfind("```")
+        if closing != -1:
+            cleaned = cleaned[:closing]
+        cleaned = cleaned.strip()
+    elif "```" in cleaned:
+        fenced = _FENCE_RE.search(cleaned)
+        if fenced is not None:
+            cleaned = fenced.group(1).strip()
 
     # 2. Parse JSON
     try:
-        data = json.loads(cleaned)
-    except json.JSONDecodeError as e:
+        return orjson.loads(cleaned)
+    except orjson.JSONDecodeError as e:
         logger.error("Failed to parse LLM response as JSON: %s\nResponse: %s", e, cleaned[:200])
         raise ValueError("LLM returned malformed JSON.") from e
 
-    # 3. Extract standard format
-    candidates_data = data.get("candidates", [])
-    if not isinstance(candidates_data, list):
-         # Try direct array
-         if isinstance(data, list):
-             candidates_data = data
-         else:
-             raise ValueError("JSON does not contain a 'candidates' array.")
 
-    # 4. Convert to objects
+def _build_candidates(candidates_data: list) -> list[ConfounderCandidate]:
+    """Convert raw candidate dicts to objects, skipping implausible entries."""
     results = []
     for item in candidates_data:
         try:
@@ -84,6 +83,61 @@ def parse_candidates(llm_response: str) -> list[ConfounderCandidate]:
                 logger.warning("Skipping implausible candidate (missing fields): %s", item.get("name"))
         except Exception as e:
             logger.warning("Failed to parse candidate item: %s. Error: %s", item, e)
+    return results
+
+
+def parse_candidates(llm_response: str) -> list[ConfounderCandidate]:
+    """
+    Parse the JSON response from the LLM into ConfounderCandidate objects.
+    Handles potential markdown code blocks wrapping the JSON.
+    """
+    data = _load_json(llm_response)
+
+    # 3. Extract standard format
+    if isinstance(data, list):
+        candidates_data = data
+    elif isinstance(data, dict) and isinstance(data.get("candidates", []), list):
+        candidates_data = data.get("candidates", [])
+    else:
+        raise ValueError("JSON does not contain a 'candidates' array.")
+
+    # 4. Convert to objects
+    results = _build_candidates(candidates_data)
 
     logger.info("Parsed %d valid confounder candidates from LLM response", len(results))
     return results
+
+
+def parse_batched_candidates(llm_response: str, n: int) -> list[list[ConfounderCandidate]]:
+    """
+    Parse a batched LLM response into one candidate list per study.
+
+    Entries are matched to studies by their 1-based ``index``; studies the
+    LLM skipped (or indices out of range) yield an empty list.
+    """
+    data = _load_json(llm_response)
+
+    studies_data = data.get("studies") if isinstance(data, dict) else data
+    if not isinstance(studies_data, list):
+        raise ValueError("JSON does not contain a 'studies' array.")
+
+    grouped: list[list[ConfounderCandidate]] = [[] for _ in range(n)]
+    for pos, entry in enumerate(studies_data, 1):
+        if not isinstance(entry, dict):
+            logger.warning("Skipping malformed batch entry: %s", entry)
+            continue
+        try:
+            idx = int(entry.get("index", pos))
+        except (TypeError, ValueError):
+            logger.warning("Skipping batch entry with invalid index: %s", entry.get("index"))
+            continue
+        if not 1 <= idx <= n:
+            logger.warning("Skipping batch entry with out-of-range index %d (n=%d)", idx, n)
+            continue
+        candidates_data = entry.get("candidates", [])
+        if isinstance(candidates_data, list):
+            grouped[idx - 1].extend(_build_candidates(candidates_data))
+
+    logger.info("Parsed batched LLM response for %d studies (%d candidates total)",
+                n, sum(len(g) for g in grouped))
+    return grouped
@@ -2,56 +2,150 @@
 
 from __future__ import annotations
 
+import textwrap
+from collections.abc import Sequence
+from functools import lru_cache
+from string import Template
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from confounder.data.loader import Study
+
 SYSTEM_PROMPT = """You are a causal inference expert reviewing an observational study design.
 Your task is to identify critical hidden confounders that researchers often miss.
 You think strictly in terms of causal mechanisms, not just loose correlations."""
 
-CANDIDATE_GENERATION_PROMPT = """Review the following observational study setup.
+# Shared building blocks, so single-study and batched prompts ask for the same thing.
+# Literal braces are doubled because the public templates are str.format strings.
+_CANDIDATE_CRITERIA = """Based on domain knowledge and causal theory, \
+propose up to 8 candidate confounding variables that:
+1. Plausibly cause BOTH the treatment selection AND the outcome.
+2. Are fundamentally distinct from the measured covariates (do not just rename them).
+3. Would bias the treatment effect estimate if left completely unmeasured."""
+
+_CANDIDATE_SCHEMA = """{{
+  "name": "snake_case_variable_name",
+  "description": "Clear 1-sentence definition of what this variable measures",
+  "causes_treatment_because": "Mechanistic reason why this causes X",
+  "causes_outcome_because": "Mechanistic reason why this causes Y independent of X",
+  "severity": "high"  // "low", "medium", or "high"
+}}"""
 
-Research Question: {research_question}
-Treatment Variable: {treatment}
-Outcome Variable: {outcome}
-Measured Covariates: {covariates}
+_JSON_ONLY = "Output ONLY the JSON, with no markdown formatting or conversational text."
+
+CANDIDATE_GENERATION_PROMPT = f"""Review the following observational study setup.
+
+Research Question: {{research_question}}
+Treatment Variable: {{treatment}}
+Outcome Variable: {{outcome}}
+Measured Covariates: {{covariates}}
 
 Background Context:
-{context}
+{{context}}
 
-Based on domain knowledge and causal theory, propose up to 8 candidate confounding variables that:
-1. Plausibly cause BOTH the treatment selection AND the outcome.
-2. Are fundamentally distinct from the measured covariates (do not just rename them).
-3. Would bias the treatment effect estimate if left completely unmeasured.
+{_CANDIDATE_CRITERIA}
 
-You must output your response ONLY as a JSON object with a single key "candidates" containing a list of objects exactly matching this format:
+You must output your response ONLY as a JSON object with a single key "candidates" \
+containing a list of objects exactly matching this format:
 
-{{
+{{{{
   "candidates": [
-    {{
-      "name": "snake_case_variable_name",
-      "description": "Clear 1-sentence definition of what this variable measures",
-      "causes_treatment_because": "Mechanistic reason why this causes X",
-      "causes_outcome_because": "Mechanistic reason why this causes Y independent of X",
-      "severity": "high"  // "low", "medium", or "high"
-    }}
+{textwrap.indent(_CANDIDATE_SCHEMA, "    ")}
   ]
-}}
+}}}}
+
+{_JSON_ONLY}"""
+
+BATCH_GENERATION_PROMPT = f"""Review the following {{n_studies}} observational study setups.
+Each study is labelled with a bracketed index such as [1].
+
+{{studies}}
+
+For EACH study independently: {_CANDIDATE_CRITERIA}
+
+You must output your response ONLY as a JSON object with a single key "studies" \
+containing one entry per study, exactly matching this format:
+
+{{{{
+  "studies": [
+    {{{{
+      "index": 1,
+      "candidates": [
+{textwrap.indent(_CANDIDATE_SCHEMA, "        ")}
+      ]
+    }}}}
+  ]
+}}}}
+
+{_JSON_ONLY}"""
+
+
+def _as_template(prompt: str, *fields: str) -> Template:
+    """
+    ``string.Template`` with the same text as the ``str.format`` ``prompt``.
+
+    Parsed once at import, and substituting it needs no brace escaping, so
+    values such as research questions may contain ``{`` or ``}`` freely.
+    """
+    return Template(prompt.format_map({field: f"${field}" for field in fields}))
+
+
+_CANDIDATE_GENERATION_TEMPLATE = _as_template(
+    CANDIDATE_GENERATION_PROMPT,
+    "research_question", "treatment", "outcome", "covariates", "context",
+)
+_BATCH_GENERATION_TEMPLATE = _as_template(BATCH_GENERATION_PROMPT, "n_studies", "studies")
 
-Output ONLY the JSON, with no markdown formatting or conversational text."""
 
 def format_generation_prompt(
     research_question: str,
     treatment: str,
     outcome: str,
-    covariates: list[str],
+    covariates: Sequence[str],
     context: str | None,
 ) -> str:
     """Format the generation prompt with study details."""
+    return _format_generation_prompt(
+        research_question, treatment, outcome, tuple(covariates), context
+    )
+
+
+@lru_cache(maxsize=256)
+def _format_generation_prompt(
+    research_question: str,
+    treatment: str,
+    outcome: str,
+    covariates: tuple[str, ...],
+    context: str | None,
+) -> str:
+    """Memoised body of :func:`format_generation_prompt` (covariates must be hashable)."""
     covs = ", ".join(covariates) if covariates else "None listed"
     ctx = context or "No background context provided. Rely on general domain knowledge."
-    
-    return CANDIDATE_GENERATION_PROMPT.format(
+
+    return _CANDIDATE_GENERATION_TEMPLATE.substitute(
         research_question=research_question,
         treatment=treatment,
         outcome=outcome,
         covariates=covs,
         context=ctx,
     )
+
+
+def format_batch_generation_prompt(studies: list[Study]) -> str:
+    """Format a single prompt covering several studies, keyed by ``[index]``."""
+    blocks = []
+    for i, study in enumerate(studies, 1):
+        covs = ", ".join(study.measured_covariates) if study.measured_covariates else "None listed"
+        ctx = study.background_context or "None provided."
+        blocks.append(
+            f"[{i}] question: {study.research_question}\n"
+            f"    treatment: {study.treatment}\n"
+            f"    outcome: {study.outcome}\n"
+            f"    covariates: {covs}\n"
+            f"    context: {ctx}"
+        )
+
+    return _BATCH_GENERATION_TEMPLATE.substitute(
+        n_studies=len(studies),
+        studies="\n".join(blocks),
+    )
@@ -2,6 +2,7 @@
 
 import pandas as pd
 import numpy as np
+from scipy.special import expit
 from confounder.data.loader import Study
 from confounder.llm.parser import ConfounderCandidate
 from confounder.detection.validator import validate_candidates
@@ -15,7 +16,7 @@ def run_example():
     
     # Highly active users are more likely to find/use the new feature (treatment)
     user_activity = rng.normal(50, 15, n)
-    prob_t = 1 / (1 + np.exp(-(user_activity - 50) / 10))
+    prob_t = expit((user_activity - 50) / 10)
     treatment = rng.binomial(1, prob_t)
     
     # Highly active users also naturally spend more (outcome)
@@ -39,7 +40,8 @@ def run_example():
     )
     
     print("\n--- Confounder A/B Test Example ---")
-    print(f"Naive effect (means): {df[df['saw_new_feature']==1]['spend_amount'].mean() - df[df['saw_new_feature']==0]['spend_amount'].mean():.2f}")
+    group_means = df.groupby("saw_new_feature", observed=True, sort=False)["spend_amount"].mean()
+    print(f"Naive effect (means): {group_means.loc[1] - group_means.loc[0]:.2f}")
     print(f"True causal effect: 2.00")
     
     # 2. Simulate LLM Candidates (In reality, we'd call the LLMAdapter here)
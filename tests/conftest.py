@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
-import pandas as pd
+import dataclasses
+import json
+import os
+
+# Use litellm's bundled model-cost map instead of fetching it over the network
+# on import; set before anything imports litellm.
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
 import pytest
 
 from confounder.config import ConfounderSettings
 from confounder.data.loader import Study
+from confounder.detection.statistical import check_confounding_criteria
+from confounder.llm.parser import ConfounderCandidate
 from tests.fixtures.synthetic_studies import generate_scenario_1_measured_confounder
 
 
@@ -20,17 +29,76 @@ def settings():
     )
 
 
+@pytest.fixture(scope="session")
+def sample_candidates():
+    """
+    Candidate vocabulary shared by the tests, keyed by name. Candidates are
+    frozen, so one set serves the whole session.
+    """
+    severities = {
+        "age": "high",
+        "genetics": "high",
+        "height": "low",
+        "income": "high",
+        "motivation": "medium",
+        "school_size": "low",
+        "student_age": "high",
+    }
+    return {
+        name: ConfounderCandidate(name, "desc", "cx", "cy", severity)
+        for name, severity in severities.items()
+    }
+
+
 @pytest.fixture
+def mock_llm_candidates(mocker):
+    """
+    Patch the blocking LLM call to propose ``student_age``, scenario 1's real
+    confounder. Tests that need a different reply override ``return_value``.
+    """
+    mock = mocker.patch("confounder.llm.adapter.LLMAdapter.complete")
+    mock.return_value = json.dumps({"candidates": [{
+        "name": "student_age", "description": "a", "causes_treatment_because": "b",
+        "causes_outcome_because": "c", "severity": "high",
+    }]})
+    return mock
+
+
+@pytest.fixture(scope="session")
 def scenario_1_study():
-    """Study loaded with scenario 1 data (measured confounder present)."""
-    data_dict = generate_scenario_1_measured_confounder(n_samples=500, seed=42)
-    df = pd.DataFrame(data_dict)
-    
+    """
+    Study loaded with scenario 1 data (measured confounder present).
+
+    Built once per session and shared, so tests must not modify it; use
+    ``scenario_1_study_copy`` for that.
+    """
     return Study(
-        data=df,
+        data=generate_scenario_1_measured_confounder(n_samples=500, seed=42),
         treatment="received_tutoring",
         outcome="test_score",
         measured_covariates=["student_age", "school_size"],
         research_question="Does online tutoring improve test scores?",
         background_context="Education setting where age affects tutoring adoption and baseline scores."
     )
+
+
+@pytest.fixture
+def scenario_1_study_copy(scenario_1_study):
+    """A private copy of ``scenario_1_study`` that a test may freely modify."""
+    return dataclasses.replace(
+        scenario_1_study,
+        data=scenario_1_study.data.copy(),
+        measured_covariates=list(scenario_1_study.measured_covariates),
+    )
+
+
+@pytest.fixture(scope="session")
+def scenario_1_confounding_results(scenario_1_study):
+    """``check_confounding_criteria`` for the real and the noise covariate, run once."""
+    return {
+        col: check_confounding_criteria(
+            col, scenario_1_study.treatment, scenario_1_study.outcome, [],
+            scenario_1_study.data, alpha=0.05,
+        )
+        for col in ("student_age", "school_size")
+    }
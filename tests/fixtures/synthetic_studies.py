@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
-import csv
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
+from scipy.special import expit
 
 
 def generate_scenario_1_measured_confounder(
     n_samples: int = 500,
     seed: int = 42,
-) -> dict[str, list[float]]:
+    rng: np.random.Generator | None = None,
+) -> pd.DataFrame:
     """
     Scenario 1: True model is Z -> X, Z -> Y, X -> Y.
     Z = Age (Measured Confounder)
@@ -21,8 +23,14 @@ def generate_scenario_1_measured_confounder(
     True Treatment Effect: +5 points
     Age bias: Older students less likely to get tutoring (X), but naturally score higher (Y).
     Resulting in a biased (underestimated or negative) naive treatment effect.
+
+    Draws come from ``rng`` when given (``seed`` is then ignored), so several
+    scenarios can share one stream. Continuous columns are float32 and binary
+    ones int8: half (or an eighth) of the default memory, and ample precision
+    for effects of this size.
     """
-    rng = np.random.default_rng(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
     # Age (Z): 10 to 18
     age = rng.uniform(10, 18, n_samples)
@@ -30,7 +38,7 @@ def generate_scenario_1_measured_confounder(
     # Treatment (X): Probability decreases with age
     # p(X=1) = logistic(5 - 0.4 * age)
     logits_x = 5.0 - 0.4 * age
-    p_x = 1.0 / (1.0 + np.exp(-logits_x))
+    p_x = expit(logits_x)
     treatment = rng.binomial(n=1, p=p_x)
     
     # Outcome (Y): True effect of treatment=+5, Age adds 2 points per year naturally
@@ -44,18 +52,19 @@ def generate_scenario_1_measured_confounder(
     # Unrelated measured covariate (W)
     school_size = rng.normal(1000, 200, n_samples)
     
-    return {
-        "student_age": age.tolist(),
-        "school_size": school_size.tolist(),
-        "received_tutoring": treatment.tolist(),
-        "test_score": outcome.tolist(),
-    }
+    return pd.DataFrame({
+        "student_age": age.astype(np.float32),
+        "school_size": school_size.astype(np.float32),
+        "received_tutoring": treatment.astype(np.int8),
+        "test_score": outcome.astype(np.float32),
+    })
 
 
 def generate_scenario_2_unmeasured_confounder(
     n_samples: int = 500,
     seed: int = 42,
-) -> dict[str, list[float]]:
+    rng: np.random.Generator | None = None,
+) -> pd.DataFrame:
     """
     Scenario 2: True model Z -> X, Z -> Y. No direct X -> Y effect.
     Z = Genetic Predisposition (UNMEASURED)
@@ -64,47 +73,53 @@ def generate_scenario_2_unmeasured_confounder(
     
     True Treatment Effect: 0
     Naive Effect: Positive (Appears coffee causes high heart rate)
+
+    ``rng`` and the column dtypes work as in scenario 1.
     """
-    rng = np.random.default_rng(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
     
     # Genetics (Z, unmeasured): Standard normal
     genetics = rng.normal(0, 1, n_samples)
     
     # Treatment (X): Depends on genetics
     coffee_cups = rng.poisson(lam=np.exp(genetics))
-    binary_coffee = (coffee_cups > 2).astype(int)
+    # Reinterpret the comparison's bool bytes as 0/1 instead of copying to int64
+    binary_coffee = (coffee_cups > 2).view(np.int8)
     
-    # Outcome (Y): Depends on genetics, NO effect from coffee
+    # Drawn in this order so a seed keeps producing the same data
+    noise = rng.normal(0, 5, n_samples)
+    # Measured covariate
+    age = rng.uniform(20, 60, n_samples)
+
+    # Outcome (Y): Depends on genetics, NO effect from coffee (no binary_coffee term)
     heart_rate = (
-        60.0 + 
+        60.0 +
         15.0 * genetics +     # strong confounding
-        0.0 * binary_coffee + # NO causal effect
-        rng.normal(0, 5, n_samples)
+        noise +
+        0.5 * age             # age affects heart rate but not coffee
     )
     
-    # Measured covariate
-    age = rng.uniform(20, 60, n_samples)
-    heart_rate += 0.5 * age  # age affects heart rate but not coffee
-    
-    return {
+    return pd.DataFrame({
         # 'genetics' is intentionally omitted from output!
-        "age": age.tolist(),
-        "drinks_coffee": binary_coffee.tolist(),
-        "heart_rate": outcome.tolist() if 'outcome' in locals() else heart_rate.tolist(), # fixed missing var
-    }
+        "age": age.astype(np.float32),
+        "drinks_coffee": binary_coffee,
+        "heart_rate": heart_rate.astype(np.float32),
+    })
 
 
-def save_as_csv(data: dict[str, list[float]], path: str | Path) -> None:
-    """Save metric data as wide-format CSV."""
+def save_as_csv(data: pd.DataFrame, path: str | Path) -> None:
+    """Save metric data as wide-format CSV (columns sorted by name)."""
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    keys = sorted(data.keys())
-    n = len(next(iter(data.values())))
-    with open(path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(keys)
-        for i in range(n):
-            writer.writerow([round(data[k][i], 4) for k in keys])
+    keys = sorted(data.columns)
+    columns = [data[k].to_numpy() for k in keys]
+    # Integer columns stay integers; "%.4f" does the 4-decimal rounding while formatting
+    fmt = ["%d" if col.dtype.kind in "biu" else "%.4f" for col in columns]
+    np.savetxt(
+        path, np.column_stack(columns), fmt=fmt, delimiter=",",
+        header=",".join(keys), comments="",
+    )
 
 
 if __name__ == "__main__":
@@ -2,22 +2,73 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
-from confounder.api.server import app
+from confounder._jit import HAS_NUMBA
+from confounder.api import server
+from confounder.api.routes import MAX_BATCH_STUDIES
+from confounder.api.server import ORJSONResponse, _warm_up, app
+from confounder.config import ConfounderSettings
+from confounder.detection import statistical
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    """One client for the session: lifespan (and warm-up) run once, on first use."""
+    with TestClient(app) as client:
+        client.get("/health")
+        yield client
 
 
-client = TestClient(app)
+@pytest.fixture
+def mock_llm(mocker):
+    """Patch the LLM call the routes make; tests set its return value or side effect."""
+    return mocker.patch("confounder.llm.adapter.LLMAdapter.acomplete")
 
-def test_health_check():
-    response = client.get("/health")
+
+def test_health_check(api_client):
+    response = api_client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
 
 
-def test_get_providers():
-    response = client.get("/providers")
+def test_startup_runs_warm_up(mocker):
+    warm_up = mocker.spy(server, "_warm_up")
+    check = mocker.spy(server, "check_confounding_criteria")
+    with TestClient(app):
+        warm_up.assert_called_once()
+        check.assert_called_once()
+
+
+def test_warm_up_exercises_analysis_paths(mocker):
+    spies = [
+        mocker.spy(server, name)
+        for name in ("validate_study", "estimate_bias", "check_confounding_criteria")
+    ]
+
+    _warm_up()
+
+    for spy in spies:
+        spy.assert_called_once()
+    # Both fits must run so both regression kernels get compiled
+    assert spies[2].spy_return["causes_outcome"] is not None
+    if HAS_NUMBA:
+        assert statistical._ols_core.signatures
+        assert statistical._logit_core.signatures
+
+
+def test_orjson_response_serializes_numpy():
+    body = ORJSONResponse({"bias": np.float64(1.5), "counts": np.arange(3)}).body
+    assert body == b'{"bias":1.5,"counts":[0,1,2]}'
+
+
+def test_get_providers(api_client):
+    response = api_client.get("/providers")
     assert response.status_code == 200
     data = response.json()
     assert "providers" in data
@@ -26,9 +77,7 @@ def test_get_providers():
 
 
 # We mock the LLM adapter so we don't make real network calls during test
-def test_check_study_api(mocker):
-    # Mock LLM Adapter
-    mock_llm = mocker.patch("confounder.llm.adapter.LLMAdapter.complete")
+def test_check_study_api(api_client, mock_llm):
     mock_llm.return_value = '{"candidates": [{"name": "age", "description": "a", "causes_treatment_because": "b", "causes_outcome_because": "c", "severity": "high"}]}'
 
     payload = {
@@ -46,9 +95,181 @@ def test_check_study_api(mocker):
         "min_samples": 5 # low threshold so test passes
     }
 
-    response = client.post("/check", json=payload)
+    response = api_client.post("/check", json=payload)
     
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "success"
     assert "ranked_confounders" in data
+
+
+def test_check_study_accepts_columnar_dataset(api_client, mock_llm):
+    mock_llm.return_value = json.dumps({"candidates": [_GENETICS]})
+    records = _BATCH_STUDY["dataset_records"]
+    payload = {k: v for k, v in _BATCH_STUDY.items() if k != "dataset_records"}
+    payload["dataset_columns"] = {col: [r[col] for r in records] for col in records[0]}
+
+    response = api_client.post("/check", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["ranked_confounders"][0]["name"] == "genetics"
+
+
+def test_check_study_rejects_ragged_columns(api_client):
+    payload = dict(_BATCH_STUDY, dataset_records=[])
+    payload["dataset_columns"] = {"treatment": [0, 1], "outcome": [1.0]}
+    assert api_client.post("/check", json=payload).status_code == 422
+
+
+def test_check_study_rejects_empty_dataset(api_client):
+    payload = dict(_BATCH_STUDY, dataset_records=[])
+    assert api_client.post("/check", json=payload).status_code == 400
+
+
+def test_check_study_llm_timeout(api_client, mock_llm, mocker):
+    async def _hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    mock_llm.side_effect = _hang
+    settings = ConfounderSettings(llm_timeout=0.01, llm_max_retries=1)
+    mocker.patch("confounder.api.routes.SETTINGS", settings)
+
+    payload = {
+        "dataset_records": [
+            {"treatment": i % 2, "outcome": float(i), "age": 20 + i} for i in range(6)
+        ],
+        "treatment": "treatment",
+        "outcome": "outcome",
+        "research_question": "Does it work?",
+        "min_samples": 5
+    }
+
+    response = api_client.post("/check", json=payload)
+    assert response.status_code == 504
+
+
+def test_check_study_retries_within_deadline(api_client, mocker):
+    """A hung first attempt must be retried, not cut off by the route's deadline."""
+    reply = mocker.MagicMock()
+    reply.choices[0].message.content = '{"candidates": []}'
+    calls = []
+
+    async def _flaky(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return reply
+
+    mocker.patch("litellm.acompletion", side_effect=_flaky)
+    settings = ConfounderSettings(llm_timeout=0.2, llm_max_retries=2)
+    mocker.patch("confounder.api.routes.SETTINGS", settings)
+
+    payload = {
+        "dataset_records": [
+            {"treatment": i % 2, "outcome": float(i), "age": 20 + i} for i in range(6)
+        ],
+        "treatment": "treatment",
+        "outcome": "outcome",
+        "research_question": "Does it work?",
+        "min_samples": 5
+    }
+
+    response = api_client.post("/check", json=payload)
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+_GENETICS = {
+    "name": "genetics",
+    "description": "a",
+    "causes_treatment_because": "b",
+    "causes_outcome_because": "c",
+    "severity": "high",
+}
+
+
+def _batch_reply(n_studies: int) -> str:
+    """Batched LLM reply proposing one unmeasured confounder for study [1] only."""
+    studies = [{"index": 1, "candidates": [_GENETICS]}]
+    studies += [{"index": i, "candidates": []} for i in range(2, n_studies + 1)]
+    return json.dumps({"studies": studies})
+
+
+_BATCH_STUDY = {
+    "dataset_records": [
+        {"treatment": i % 2, "outcome": float(i), "age": 20 + i} for i in range(6)
+    ],
+    "treatment": "treatment",
+    "outcome": "outcome",
+    "research_question": "Does it work?",
+    "min_samples": 5
+}
+
+
+def test_check_batch_api(api_client, mock_llm):
+    mock_llm.return_value = _batch_reply(2)
+
+    response = api_client.post("/check_batch", json=[_BATCH_STUDY, _BATCH_STUDY])
+
+    assert response.status_code == 200
+    assert mock_llm.call_count == 1
+    results = response.json()["results"]
+    assert len(results) == 2
+    assert [r["name"] for r in results[0]["ranked_confounders"]] == ["genetics"]
+    assert results[1]["ranked_confounders"] == []
+
+
+def test_check_batch_api_chunks_large_batches(api_client, mock_llm, mocker):
+    async def _reply(prompt, **kwargs):
+        n = prompt.count("] question:")
+        return _batch_reply(n)
+
+    mock_llm.side_effect = _reply
+    settings = ConfounderSettings(llm_batch_size=4, llm_max_output_tokens=100)
+    mocker.patch("confounder.api.routes.SETTINGS", settings)
+
+    response = api_client.post("/check_batch", json=[_BATCH_STUDY] * 6)
+
+    assert response.status_code == 200
+    assert mock_llm.call_count == 2
+    assert sorted(c.kwargs["max_tokens"] for c in mock_llm.call_args_list) == [200, 400]
+    names = [[r["name"] for r in res["ranked_confounders"]] for res in response.json()["results"]]
+    assert names == [["genetics"], [], [], [], ["genetics"], []]
+
+
+def test_check_batch_api_rejects_oversized_batch(api_client):
+    response = api_client.post("/check_batch", json=[_BATCH_STUDY] * (MAX_BATCH_STUDIES + 1))
+    assert response.status_code == 400
+
+
+def _sse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        data = json.loads(data_line.removeprefix("data: "))
+        events.append((event_line.removeprefix("event: "), data))
+    return events
+
+
+def test_check_study_stream_emits_phases(api_client, mock_llm):
+    mock_llm.return_value = json.dumps({"candidates": [_GENETICS]})
+
+    response = api_client.post("/check/stream", json=_BATCH_STUDY)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [e for e, _ in events] == ["phase"] * 4
+    assert [d["phase"] for _, d in events] == ["validate", "llm_done", "bias_done", "report_done"]
+    assert events[1][1]["candidates"] == ["genetics"]
+    assert events[3][1]["report"]["status"] == "success"
+
+
+def test_check_study_stream_reports_llm_failure(api_client, mock_llm):
+    mock_llm.side_effect = RuntimeError("down")
+
+    response = api_client.post("/check/stream", json=_BATCH_STUDY)
+
+    events = _sse_events(response.text)
+    assert [e for e, _ in events] == ["phase", "error"]
+    assert events[1][1]["status_code"] == 502
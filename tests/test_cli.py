@@ -6,36 +6,38 @@ import tempfile
 import os
 from pathlib import Path
 
-import pandas as pd
 import pytest
 from typer.testing import CliRunner
 
+import confounder.estimation.bias as bias_module
 from confounder.cli import app
 
 
-runner = CliRunner()
+@pytest.fixture
+def runner():
+    return CliRunner()
 
 
-def test_version():
+def test_version(runner):
     result = runner.invoke(app, ["--version"])
     assert "confounder" in result.output.lower()
 
 
-def test_providers():
+def test_providers(runner):
     result = runner.invoke(app, ["providers"])
     # Rich console output may not be captured by Typer CliRunner.
     # Just verify the command doesn't crash.
     assert result.exit_code == 0
 
 
-def test_check_missing_args():
+def test_check_missing_args(runner):
     """CLI should show an error or help when required arguments are missing."""
     result = runner.invoke(app, ["check"])
     # Typer auto-generates usage error for missing options
     assert result.exit_code in [0, 2]
 
 
-def test_check_invalid_file():
+def test_check_invalid_file(runner):
     """CLI should exit 1 when given a file missing the treatment column."""
     with tempfile.NamedTemporaryFile(suffix=".csv", mode="w", delete=False) as tmp:
         tmp.write("x\n1\n2\n3\n")
@@ -49,22 +51,19 @@ def test_check_invalid_file():
         os.unlink(tmp_name)
 
 
-def test_check_mocked(mocker, tmp_path: Path):
-    from tests.fixtures.synthetic_studies import generate_scenario_1_measured_confounder
-    data = generate_scenario_1_measured_confounder(n_samples=200)
-    df = pd.DataFrame(data)
-    
-    csv_path = tmp_path / "test.csv"
-    df.to_csv(csv_path, index=False)
-
-    mock_llm = mocker.patch("confounder.llm.adapter.LLMAdapter.complete")
-    mock_llm.return_value = '{"candidates": [{"name": "student_age", "description": "a", "causes_treatment_because": "b", "causes_outcome_because": "c", "severity": "high"}]}'
+def test_check_mocked(
+    runner, mocker, tmp_path: Path, monkeypatch, scenario_1_study, mock_llm_candidates
+):
+    # Hand the study straight to the CLI; CSV parsing is covered by the loader tests
+    load = mocker.patch("confounder.data.loader.load_study", return_value=scenario_1_study)
 
     mocker.patch("webbrowser.open")
+    # --graph writes the DAG to the working directory
+    monkeypatch.chdir(tmp_path)
 
     result = runner.invoke(app, [
         "check", 
-        "-d", str(csv_path), 
+        "-d", "study.csv", 
         "-t", "received_tutoring", 
         "-o", "test_score", 
         "-q", "does it work?",
@@ -72,3 +71,23 @@ def test_check_mocked(mocker, tmp_path: Path):
     ])
     
     assert result.exit_code == 0
+    assert load.call_args.args[:3] == ("study.csv", "received_tutoring", "test_score")
+    assert (tmp_path / "confounder_dag.html").exists()
+    mock_llm_candidates.assert_called_once()
+
+
+def test_check_workers(runner, mocker, tmp_path: Path, mock_llm_candidates):
+    from tests.fixtures.synthetic_studies import generate_scenario_1_measured_confounder
+    csv_path = tmp_path / "test.csv"
+    generate_scenario_1_measured_confounder(n_samples=200).to_csv(csv_path, index=False)
+
+    spy = mocker.spy(bias_module, "estimate_biases")
+
+    args = ["check", "-d", str(csv_path), "-t", "received_tutoring", "-o", "test_score", "-q", "q"]
+    result = runner.invoke(app, args + ["--workers", "2"])
+
+    assert result.exit_code == 0
+    assert spy.call_args.kwargs == {"processes": True, "max_workers": 2}
+
+    result = runner.invoke(app, args + ["--workers", "-1"])
+    assert result.exit_code == 2
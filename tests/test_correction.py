@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
+import pandas as pd
+
 from confounder.correction.suggester import suggest_corrections
 from confounder.correction.explainer import rank_confounders, generate_report
+from confounder.data.loader import Study
 from confounder.detection.validator import ValidatedConfounder
+from confounder.graph.visualizer import render_confounder_dag
 from confounder.llm.parser import ConfounderCandidate
 
 
 class TestSuggestions:
     
-    def test_suggest_corrections_measured(self):
-        cand = ConfounderCandidate("age", "desc", "cx", "cy", "high")
+    def test_suggest_corrections_measured(self, sample_candidates):
+        cand = sample_candidates["age"]
         conf = ValidatedConfounder(cand, True, "age", 0.01, 0.01, True, 2.5, 30.0)
         
         recs = suggest_corrections([conf])
@@ -21,8 +25,8 @@ class TestSuggestions:
         assert "control" in actions
         assert "stratify" in actions
 
-    def test_suggest_corrections_unmeasured(self):
-        cand = ConfounderCandidate("genetics", "desc", "cx", "cy", "high")
+    def test_suggest_corrections_unmeasured(self, sample_candidates):
+        cand = sample_candidates["genetics"]
         conf = ValidatedConfounder(cand, False, None)
         
         recs = suggest_corrections([conf])
@@ -32,9 +36,9 @@ class TestSuggestions:
         assert "sensitivity" in actions
         assert "study_design" in actions
 
-    def test_suggest_corrections_measured_low_bias(self):
+    def test_suggest_corrections_measured_low_bias(self, sample_candidates):
         """Low bias should NOT trigger stratification."""
-        cand = ConfounderCandidate("height", "desc", "cx", "cy", "low")
+        cand = sample_candidates["height"]
         conf = ValidatedConfounder(cand, True, "height", 0.04, 0.03, True, 0.5, 5.0)
         
         recs = suggest_corrections([conf])
@@ -47,28 +51,47 @@ class TestSuggestions:
 
 class TestRanking:
 
-    def test_rank_confounders(self):
+    def test_rank_confounders(self, sample_candidates):
         c1 = ValidatedConfounder(
-            ConfounderCandidate("c1", "", "", "", "high"), True, "c1",
+            sample_candidates["age"], True, "age",
             is_statistically_significant=True, bias_percentage=30.0
         )
         c2 = ValidatedConfounder(
-            ConfounderCandidate("c2", "", "", "", "low"), True, "c2",
+            sample_candidates["height"], True, "height",
             is_statistically_significant=True, bias_percentage=5.0
         )
-        c3 = ValidatedConfounder(
-            ConfounderCandidate("c3", "", "", "", "medium"), False, None
-        )
+        c3 = ValidatedConfounder(sample_candidates["motivation"], False, None)
         
         ranked = rank_confounders([c1, c2, c3])
         assert len(ranked) == 3
         # c1 is critical (priority 1)
-        assert ranked[0].confounder.candidate.name == "c1"
+        assert ranked[0].confounder.candidate.name == "age"
         assert ranked[0].severity == "Critical"
 
-    def test_generate_report(self, scenario_1_study):
+    def test_rank_confounders_order_and_filtering(self):
+        minor = ValidatedConfounder(
+            ConfounderCandidate("minor", "", "", "", "low"), True, "minor",
+            is_statistically_significant=True, bias_percentage=-5.0
+        )
+        rejected = ValidatedConfounder(
+            ConfounderCandidate("rejected", "", "", "", "high"), True, "rejected"
+        )
+        moderate = ValidatedConfounder(
+            ConfounderCandidate("moderate", "", "", "", "low"), True, "moderate",
+            is_statistically_significant=True, bias_percentage=-15.0
+        )
+        unmeasured = ValidatedConfounder(
+            ConfounderCandidate("genetics", "", "", "", "HIGH"), False, None
+        )
+
+        ranked = rank_confounders([minor, rejected, moderate, unmeasured])
+        assert [r.confounder.candidate.name for r in ranked] == ["genetics", "moderate", "minor"]
+        assert [r.priority for r in ranked] == [1, 2, 4]
+        assert [r.severity for r in ranked] == ["Critical", "Moderate", "Minor"]
+
+    def test_generate_report(self, scenario_1_study, sample_candidates):
         c1 = ValidatedConfounder(
-            ConfounderCandidate("c1", "", "", "", "high"), True, "c1",
+            sample_candidates["student_age"], True, "student_age",
             is_statistically_significant=True, bias_percentage=30.0
         )
         
@@ -79,3 +102,31 @@ class TestRanking:
         assert report.adjusted_estimate == 3.0
         assert report.has_critical_confounders == True
         assert len(report.recommendations) == 1
+
+
+def test_render_confounder_dag(tmp_path):
+    study = Study(pd.DataFrame(), "treatment", "outcome", [], "Q")
+    conf = ValidatedConfounder(
+        ConfounderCandidate("genetics", "", "</script>", "cy", "high"), False, None
+    )
+
+    path = render_confounder_dag(study, rank_confounders([conf]), tmp_path / "dag.html")
+
+    html = path.read_text(encoding="utf-8")
+    assert '"id": "genetics"' in html
+    assert '"label": "genetics\\n(Unmeasured)"' in html
+    assert html.count("</script>") == 2
+
+
+def test_render_confounder_dag_dedupes_node_ids(tmp_path):
+    study = Study(pd.DataFrame(), "treatment", "outcome", [], "Q")
+    confs = [
+        ValidatedConfounder(ConfounderCandidate(name, "", "ct", "cy", "high"), False, None)
+        for name in ("genetics", "genetics", "treatment")
+    ]
+
+    path = render_confounder_dag(study, rank_confounders(confs), tmp_path / "dag.html")
+
+    html = path.read_text(encoding="utf-8")
+    assert html.count('"id": "genetics"') == 1
+    assert html.count('"id": "treatment"') == 1
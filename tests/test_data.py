@@ -5,10 +5,11 @@ from __future__ import annotations
 import tempfile
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from confounder.data.loader import Study, load_study
+from confounder.data.loader import NumericFrame, Study, load_study
 from confounder.data.validator import validate_study
 
 
@@ -51,18 +52,59 @@ class TestDataLoader:
             load_study(csv_path, "t", "o", "q")
 
 
+    def test_from_dataframe_excludes_metadata(self):
+        df = pd.DataFrame({"ID": [1, 2], "age": [3, 4], "t": [0, 1], "o": [1.0, 2.0]})
+        study = Study.from_dataframe(df, "t", "o", "q")
+        assert study.measured_covariates == ["age"]
+
+    def test_from_dataframe_excludes_mixed_case_core_columns(self):
+        df = pd.DataFrame({"Treated": [0, 1], "Score": [1.0, 2.0], "age": [3, 4]})
+        study = Study.from_dataframe(df, "Treated", "Score", "q")
+        assert study.measured_covariates == ["age"]
+
+
+    def test_numeric_frame_complete_rows(self):
+        df = pd.DataFrame({
+            "t": [0, 1, 1, 0],
+            "y": [1.0, np.nan, 3.0, 4.0],
+            "flag": [True, False, True, True],
+            "label": ["a", "b", "c", "d"],
+        })
+        frame = NumericFrame.from_frame(df)
+
+        assert "label" not in frame.col_index
+        np.testing.assert_array_equal(
+            frame.complete_rows(["y", "flag"]), [[1.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+        )
+
+        y, X = frame.design("y", ["t", "flag"])
+        np.testing.assert_array_equal(y, [1.0, 3.0, 4.0])
+        np.testing.assert_array_equal(X, [[1.0, 0.0, 1.0], [1.0, 1.0, 1.0], [1.0, 0.0, 1.0]])
+
 class TestDataValidator:
     def test_validate_valid_study(self, scenario_1_study):
         res = validate_study(scenario_1_study, min_samples=100)
         assert res.is_valid is True
         assert not res.errors
         
-    def test_validate_insufficient_samples(self, scenario_1_study):
-        scenario_1_study.data = scenario_1_study.data.iloc[:50]
-        res = validate_study(scenario_1_study, min_samples=100)
+    def test_validate_insufficient_samples(self, scenario_1_study_copy):
+        scenario_1_study_copy.data = scenario_1_study_copy.data.iloc[:50]
+        res = validate_study(scenario_1_study_copy, min_samples=100)
         assert res.is_valid is False
         assert any("Insufficient samples" in e for e in res.errors)
 
+    def test_validate_early_exit(self):
+        df = pd.DataFrame({"t": [1, 1, None], "o": [1, 1, 1], "x": [None, 1, 2]})
+        study = Study(df, "t", "o", ["x"], "q")
+
+        res = validate_study(study, min_samples=10)
+        assert res.errors == ["Insufficient samples: 3 < 10 required for reliable causal inference."]
+        assert not res.warnings
+
+        res = validate_study(study, min_samples=10, early_exit=False)
+        assert len(res.errors) == 3
+        assert res.warnings
+
     def test_validate_missing_treatment(self, tmp_path: Path):
         df = pd.DataFrame({"t": [1, None, 0], "o": [1, 2, 3]})
         study = Study(df, "t", "o", [], "q")
@@ -76,3 +118,18 @@ class TestDataValidator:
         res = validate_study(study, min_samples=2)
         assert res.is_valid is False
         assert any("no variation" in e for e in res.errors)
+
+    def test_validate_covariate_missingness_mixed_dtypes(self):
+        df = pd.DataFrame({
+            "t": [0, 1, 0, 1],
+            "o": [1.0, 2.0, 3.0, 4.0],
+            "sparse": [None, None, None, 1.0],
+            "device": ["a", None, "b", "a"],
+            "full": [1, 2, 3, 4],
+        })
+        study = Study(df, "t", "o", ["sparse", "device", "full"], "q")
+        res = validate_study(study, min_samples=2)
+        assert res.is_valid is True
+        assert any("'sparse' is missing in 75%" in w for w in res.warnings)
+        assert any("'device' has missing values" in w for w in res.warnings)
+        assert not any("'full'" in w for w in res.warnings)
@@ -5,9 +5,25 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 import pytest
+import statsmodels.api as sm
+from scipy import stats
 
-from confounder.detection.statistical import check_association, check_conditional_association, check_confounding_criteria
-from confounder.detection.validator import match_candidate_to_column, validate_candidates
+from confounder.detection import statistical
+from confounder.detection import validator as detection_validator
+from confounder.detection.statistical import (
+    check_association,
+    check_associations_batched,
+    check_conditional_association,
+    check_confounding_criteria,
+    fast_logit,
+    fast_ols,
+    with_intercept,
+)
+from confounder.detection.validator import (
+    lowercase_columns,
+    match_candidate_to_column,
+    validate_candidates,
+)
 from confounder.llm.parser import ConfounderCandidate
 
 
@@ -18,7 +34,7 @@ class TestStatisticalFoundations:
         rng = np.random.default_rng(42)
         x = rng.normal(0, 1, 100)
         y = x * 0.8 + rng.normal(0, 0.2, 100)
-        p1, sig1 = check_association(pd.Series(x), pd.Series(y))
+        p1, sig1 = check_association(x, y)
         assert sig1 == True
         assert p1 < 0.05
 
@@ -26,10 +42,76 @@ class TestStatisticalFoundations:
         rng = np.random.default_rng(42)
         x = rng.normal(0, 1, 100)
         z = rng.normal(0, 1, 100)
-        p2, sig2 = check_association(pd.Series(x), pd.Series(z))
+        p2, sig2 = check_association(x, z)
         assert sig2 == False
         assert p2 > 0.05
 
+    def test_association_nullable_dtype(self):
+        rng = np.random.default_rng(7)
+        x = pd.Series(rng.integers(0, 50, 100), dtype="Int64")
+        x[::10] = pd.NA
+        y = x.astype("Float64") * 0.5 + rng.normal(0, 1, 100)
+
+        p, sig = check_association(x, y)
+        assert sig
+        assert p < 0.05
+
+    def test_associations_batched_matches_pearsonr(self):
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 4))
+        y = X[:, 0] * 0.3 + rng.normal(size=200)
+        X[:, 2] = 1.0  # no variance
+        X[5, 1] = np.nan
+
+        p_values, significant = check_associations_batched(X, y)
+
+        keep = ~np.isnan(X).any(axis=1)
+        for j in (0, 1, 3):
+            expected = stats.pearsonr(X[keep, j], y[keep])[1]
+            assert p_values[j] == pytest.approx(expected, rel=1e-8)
+        assert p_values[2] == 1.0
+        assert significant.tolist() == [True, False, False, False]
+
+    def test_fast_ols_matches_statsmodels(self):
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame(rng.normal(size=(120, 3)), columns=["z", "a", "b"])
+        df["y"] = 0.4 * df["z"] - 0.2 * df["a"] + rng.normal(size=120)
+
+        fit = fast_ols(with_intercept(df[["z", "a", "b"]].to_numpy()), df["y"].to_numpy())
+        ref = sm.OLS(df["y"], sm.add_constant(df[["z", "a", "b"]])).fit()
+
+        assert fit.coef == pytest.approx(ref.params["z"], rel=1e-10)
+        assert fit.std_err == pytest.approx(ref.bse["z"], rel=1e-10)
+        assert fit.p_value == pytest.approx(ref.pvalues["z"], rel=1e-8)
+        assert fit.r_squared == pytest.approx(ref.rsquared, rel=1e-10)
+
+    def test_fast_logit_matches_statsmodels(self):
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(rng.normal(size=(400, 3)), columns=["z", "a", "b"])
+        df["t"] = (rng.random(400) < 1 / (1 + np.exp(-(0.8 * df["z"] - 0.3 * df["a"])))).astype(int)
+
+        X = with_intercept(df[["z", "a", "b"]].to_numpy())
+        fit = fast_logit(X, df["t"].to_numpy(dtype=float))
+        ref = sm.Logit(df["t"], sm.add_constant(df[["z", "a", "b"]])).fit(disp=0)
+
+        assert fit.coef == pytest.approx(ref.params["z"], rel=1e-8)
+        assert fit.std_err == pytest.approx(ref.bse["z"], rel=1e-8)
+        assert fit.p_value == pytest.approx(ref.pvalues["z"], rel=1e-6)
+        assert fit.r_squared == pytest.approx(ref.prsquared, rel=1e-6)
+
+    def test_compiled_cores_match_numpy(self):
+        rng = np.random.default_rng(2)
+        X = np.column_stack([np.ones(200), rng.normal(size=(200, 2))])
+        y_cont = X @ [1.0, 0.5, -0.5] + rng.normal(size=200)
+        y_bin = (rng.random(200) < 0.4).astype(float)
+
+        assert statistical._ols_core(X, y_cont, 1) == pytest.approx(
+            statistical._ols_core_numpy(X, y_cont, 1), rel=1e-10
+        )
+        assert statistical._logit_core(X, y_bin, 1, 35, 1e-8) == pytest.approx(
+            statistical._logit_core_numpy(X, y_bin, 1, 35, 1e-8), rel=1e-10
+        )
+
     def test_conditional_association_unconditional(self):
         rng = np.random.default_rng(42)
         n = 500
@@ -53,60 +135,92 @@ class TestStatisticalFoundations:
         assert sig2 == False
         assert p2 > 0.05
 
-    def test_confounding_criteria_real(self, scenario_1_study):
+    def test_conditional_association_detects_binary_target(self):
+        rng = np.random.default_rng(3)
+        z = rng.normal(0, 1, 300)
+        df = pd.DataFrame({"z": z, "t": (z + rng.normal(0, 1, 300) > 0).astype(int)})
+
+        _, _, details = check_conditional_association("t", "z", [], df)
+        assert details["model_type"] == "Logit"
+
+        df["t"] = df["t"] * 2
+        _, _, details = check_conditional_association("t", "z", [], df)
+        assert details["model_type"] == "OLS"
+
+    def test_confounding_criteria_real(self, scenario_1_confounding_results):
         """Test full confounding criteria on known confounder."""
-        result = check_confounding_criteria(
-            z_col="student_age",
-            t_col="received_tutoring",
-            y_col="test_score",
-            covariates=[],
-            data=scenario_1_study.data,
-            alpha=0.05,
-        )
+        result = scenario_1_confounding_results["student_age"]
         assert result["is_statistical_confounder"] == True
         assert result["causes_treatment"]["is_significant"] == True
         assert result["causes_outcome"]["is_significant"] == True
 
-    def test_confounding_criteria_noise(self, scenario_1_study):
+    def test_confounding_criteria_noise(self, scenario_1_confounding_results):
         """Test that random noise column is NOT identified as a confounder."""
-        result = check_confounding_criteria(
-            z_col="school_size",
-            t_col="received_tutoring",
-            y_col="test_score",
-            covariates=[],
-            data=scenario_1_study.data,
-            alpha=0.05,
-        )
+        result = scenario_1_confounding_results["school_size"]
         assert result["is_statistical_confounder"] == False
 
+    def test_confounding_criteria_early_exit(self, scenario_1_study, mocker):
+        spy = mocker.spy(statistical, "check_conditional_association")
+        args = ("school_size", "received_tutoring", "test_score", [], scenario_1_study.data)
+
+        result = check_confounding_criteria(*args)
+        assert not result["causes_treatment"]["is_significant"]
+        assert result["causes_outcome"] is None
+        assert spy.call_count == 1
+
+        full = check_confounding_criteria(*args, early_exit=False)
+        assert full["causes_outcome"]["p_value"] is not None
+        assert full["is_statistical_confounder"] == result["is_statistical_confounder"]
+
 
 class TestValidator:
     """Test mapping and validating LLM candidates."""
 
-    def test_match_exact(self):
+    def test_match_exact(self, sample_candidates):
         cols = ["student_age", "income", "received_treatment"]
-        cand = ConfounderCandidate("income", "", "", "", "high")
+        cand = sample_candidates["income"]
         assert match_candidate_to_column(cand, cols) == "income"
 
-    def test_match_fuzzy(self):
+    def test_match_fuzzy(self, sample_candidates):
         cols = ["student_age", "income", "received_treatment"]
-        cand = ConfounderCandidate("age", "", "", "", "high")
+        cand = sample_candidates["age"]
         assert match_candidate_to_column(cand, cols) == "student_age"
         
-    def test_match_none(self):
+    def test_match_with_precomputed_lowercase_map(self, sample_candidates):
+        lower_cols = lowercase_columns(["Student_Age", "Income", "income"])
+        assert lower_cols == {"student_age": "Student_Age", "income": "Income"}
+        income = sample_candidates["income"]
+        age = sample_candidates["age"]
+        assert match_candidate_to_column(income, lower_cols) == "Income"
+        assert match_candidate_to_column(age, lower_cols) == "Student_Age"
+
+    def test_match_fuzzy_tolerates_typos(self):
+        pytest.importorskip("rapidfuzz")
+        cand = ConfounderCandidate("studnet_age", "", "", "", "high")
+        assert match_candidate_to_column(cand, ["student_age", "income"]) == "student_age"
+
+    def test_match_substring_fallback_without_rapidfuzz(self, monkeypatch, sample_candidates):
+        monkeypatch.setattr(detection_validator, "process", None)
+        cols = ["student_age", "income", "received_treatment"]
+        age = sample_candidates["age"]
+        genetics = sample_candidates["genetics"]
+        assert match_candidate_to_column(age, cols) == "student_age"
+        assert match_candidate_to_column(genetics, cols) is None
+
+    def test_match_none(self, sample_candidates):
         cols = ["student_age", "income", "received_treatment"]
-        cand = ConfounderCandidate("genetics", "", "", "", "high")
+        cand = sample_candidates["genetics"]
         assert match_candidate_to_column(cand, cols) is None
         
     def test_match_short_string_blocked(self):
         cand = ConfounderCandidate("id", "", "", "", "high")
         assert match_candidate_to_column(cand, ["video_id", "user_id"]) is None
 
-    def test_validate_candidates_scenario_1(self, scenario_1_study):
+    def test_validate_candidates_scenario_1(self, scenario_1_study, sample_candidates):
         """Test if validation catches the true confounder and rejects noise."""
-        cand_real = ConfounderCandidate("student_age", "", "", "", "high")
-        cand_fake = ConfounderCandidate("school_size", "", "", "", "low")
-        cand_unmeasured = ConfounderCandidate("motivation", "", "", "", "medium")
+        cand_real = sample_candidates["student_age"]
+        cand_fake = sample_candidates["school_size"]
+        cand_unmeasured = sample_candidates["motivation"]
         
         validated = validate_candidates([cand_real, cand_fake, cand_unmeasured], scenario_1_study)
         
@@ -123,3 +237,35 @@ class TestValidator:
         val_unm = next(v for v in validated if v.candidate.name == "motivation")
         assert val_unm.is_measured == False
         assert val_unm.is_statistically_significant == False
+
+    def test_validate_candidates_keeps_input_order(self, scenario_1_study):
+        names = ["school_size", "motivation", "student_age", "test_score"]
+        cands = [ConfounderCandidate(n, "", "", "", "high") for n in names]
+
+        validated = validate_candidates(cands, scenario_1_study, max_workers=4)
+
+        # The outcome itself is dropped; everything else keeps its position
+        assert [v.candidate.name for v in validated] == names[:3]
+        assert [v.is_statistically_significant for v in validated] == [False, False, True]
+
+    def test_blas_limit_shared_across_overlapping_calls(self, monkeypatch):
+        calls = []
+
+        class FakeLimiter:
+            def __init__(self, limits, user_api):
+                calls.append("limit")
+
+            def restore_original_limits(self):
+                calls.append("restore")
+
+        monkeypatch.setattr(detection_validator, "threadpool_limits", FakeLimiter)
+        first = detection_validator._blas_single_threaded()
+        second = detection_validator._blas_single_threaded()
+
+        # Interleaved as two concurrent requests would be: the first exits first
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        assert calls == ["limit"]
+        second.__exit__(None, None, None)
+        assert calls == ["limit", "restore"]
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import numpy as np
+import pandas as pd
 import pytest
+import statsmodels.api as sm
 
+from confounder.data.loader import Study
 from confounder.detection.validator import ValidatedConfounder
-from confounder.estimation.bias import estimate_bias
+from confounder.estimation import bias as bias_module
+from confounder.estimation.bias import estimate_bias, estimate_biases, naive_effect
 from confounder.estimation.sensitivity import bound_unmeasured_confounder
 from confounder.llm.parser import ConfounderCandidate
 
@@ -31,6 +36,16 @@ class TestBiasEstimation:
         assert abs(res.adjusted_estimate - 5.0) < abs(res.naive_estimate - 5.0)
         assert res.is_problematic == True
 
+    @pytest.mark.parametrize("controls", [[], ["z"], ["z", "a"]])
+    def test_estimate_effect_matches_full_ols(self, controls):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.normal(size=(300, 3)), columns=["t", "z", "a"])
+        df["t"] = (df["t"] + df["z"] > 0).astype(int)
+        df["y"] = 0.5 * df["t"] + df["z"] + rng.normal(size=300)
+
+        ref = sm.OLS(df["y"], sm.add_constant(df[["t"] + controls])).fit().params["t"]
+        assert bias_module._estimate_effect(df, "t", "y", controls) == pytest.approx(ref, rel=1e-10)
+
     def test_estimate_bias_unmeasured_fails(self, scenario_1_study):
         cand = ConfounderCandidate("genetics", "", "", "", "high")
         conf = ValidatedConfounder(cand, False, None)
@@ -38,6 +53,79 @@ class TestBiasEstimation:
         with pytest.raises(ValueError, match="Cannot quantify"):
             estimate_bias(conf, scenario_1_study)
 
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_estimate_biases_parallel(self, scenario_1_study, processes):
+        """Only measured, significant confounders are estimated, in input order."""
+        confirmed = ValidatedConfounder(
+            ConfounderCandidate("student_age", "", "", "", "high"), True, "student_age",
+            is_statistically_significant=True,
+        )
+        rejected = ValidatedConfounder(
+            ConfounderCandidate("school_size", "", "", "", "low"), True, "school_size",
+        )
+        unmeasured = ValidatedConfounder(
+            ConfounderCandidate("genetics", "", "", "", "high"), False, None
+        )
+
+        results = estimate_biases(
+            [unmeasured, rejected, confirmed], scenario_1_study, processes=processes
+        )
+
+        assert len(results) == 1
+        assert confirmed.bias_magnitude is not None
+        assert results[0].bias_magnitude == confirmed.bias_magnitude
+        assert rejected.bias_magnitude is None
+
+    def test_estimate_biases_failed_fit_matches_across_modes(self):
+        rng = np.random.default_rng(0)
+        t = rng.integers(0, 2, size=50)
+        # Z duplicates T, so the adjusted fit has no treatment variation left
+        data = pd.DataFrame({"t": t, "z": t, "y": t + rng.normal(size=50)})
+        study = Study(data, "t", "y", ["z"], "Q")
+
+        def run(processes):
+            conf = ValidatedConfounder(
+                ConfounderCandidate("z", "", "", "", "high"), True, "z",
+                is_statistically_significant=True,
+            )
+            results = estimate_biases([conf], study, processes=processes)
+            return results, conf
+
+        thread_results, thread_conf = run(False)
+        process_results, process_conf = run(True)
+
+        assert thread_results == process_results
+        assert thread_conf.bias_magnitude is process_conf.bias_magnitude is None
+        assert thread_conf.bias_percentage is process_conf.bias_percentage is None
+
+    def test_estimate_biases_fits_naive_effect_once(self, scenario_1_study, mocker):
+        confounders = [
+            ValidatedConfounder(
+                ConfounderCandidate(col, "", "", "", "high"), True, col,
+                is_statistically_significant=True,
+            )
+            for col in ("student_age", "school_size")
+        ]
+        spy = mocker.spy(bias_module, "_estimate_effect")
+
+        results = estimate_biases(confounders, scenario_1_study)
+
+        controls = [call.args[3] for call in spy.call_args_list]
+        assert controls.count([]) == 1
+        assert len(controls) == 3
+        assert results[0].naive_estimate == results[1].naive_estimate
+        assert results[0].naive_estimate == naive_effect(scenario_1_study)
+
+    def test_naive_effect_mean_difference_fallback(self):
+        data = pd.DataFrame({"t": [0, 1, 0, 1], "y": [1.0, 3.0, 2.0, np.nan]})
+        study = Study(data, "t", "y", [], "Q")
+
+        assert naive_effect(study) == pytest.approx(1.5)
+
+        study.data["t"] = [0.0, 0.5, 1.0, 1.0]
+        with pytest.raises(ValueError, match="continuous treatment"):
+            naive_effect(study)
+
 
 class TestSensitivity:
 
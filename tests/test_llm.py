@@ -2,10 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import pickle
+import sqlite3
+
+import pandas as pd
 import pytest
 
-from confounder.llm.parser import ConfounderCandidate, parse_candidates
-from confounder.llm.prompts import format_generation_prompt
+from confounder.config import ConfounderSettings, LLMProvider
+from confounder.data.loader import Study
+from confounder.llm.adapter import ConfounderProviderError, LLMAdapter
+from confounder.llm.cache import GenerativeCache
+from confounder.llm.parser import ConfounderCandidate, parse_batched_candidates, parse_candidates
+from confounder.llm.prompts import (
+    BATCH_GENERATION_PROMPT,
+    CANDIDATE_GENERATION_PROMPT,
+    format_batch_generation_prompt,
+    format_generation_prompt,
+)
 
 
 class TestLLMParser:
@@ -47,6 +62,15 @@ class TestLLMParser:
         # Tests that space normalization works
         assert cands[0].name == "income_bracket"
 
+    @pytest.mark.parametrize("fenced", [
+        '```\n{"candidates": []}\n```',
+        '```{"candidates": []}```',
+        '```JSON\n{"candidates": []}',
+        'Here are the candidates:\n```json\n{"candidates": []}\n```\nHope this helps.',
+    ])
+    def test_parse_fence_variants(self, fenced):
+        assert parse_candidates(fenced) == []
+
     def test_parse_malformed_json_raises(self):
         with pytest.raises(ValueError, match="malformed JSON"):
             parse_candidates("{ not json }")
@@ -66,6 +90,31 @@ class TestLLMParser:
         cands = parse_candidates(json_str)
         assert len(cands) == 0
 
+    def test_candidates_are_immutable_and_hashable(self):
+        cand = ConfounderCandidate("age", "d", "X", "Y", "high")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cand.name = "income"
+        assert {cand: 1}[pickle.loads(pickle.dumps(cand))] == 1
+
+    def test_parse_batched_by_index(self):
+        json_str = """
+        {
+          "studies": [
+            {"index": 2, "candidates": [
+              {"name": "income", "description": "d", "causes_treatment_because": "X",
+               "causes_outcome_because": "Y", "severity": "low"}
+            ]},
+            {"index": 1, "candidates": [
+              {"name": "age", "description": "d", "causes_treatment_because": "X",
+               "causes_outcome_because": "Y", "severity": "high"}
+            ]},
+            {"index": 7, "candidates": []}
+          ]
+        }
+        """
+        grouped = parse_batched_candidates(json_str, 3)
+        assert [[c.name for c in g] for g in grouped] == [["age"], ["income"], []]
+
 
 def test_format_generation_prompt():
     prompt = format_generation_prompt(
@@ -75,3 +124,257 @@ def test_format_generation_prompt():
     assert "T" in prompt
     assert "C1" in prompt
     assert "Ctx" in prompt
+
+
+def test_public_prompt_constants_stay_format_strings():
+    prompt = CANDIDATE_GENERATION_PROMPT.format(
+        research_question="Q {1}", treatment="T", outcome="O", covariates="C1", context="Ctx"
+    )
+    assert prompt == format_generation_prompt("Q {1}", "T", "O", ["C1"], "Ctx")
+    assert '"candidates": [' in prompt
+
+    batch = BATCH_GENERATION_PROMPT.format(n_studies=1, studies="[1] question: Q")
+    assert '"studies": [' in batch
+
+
+def test_format_batch_generation_prompt():
+    studies = [
+        Study(pd.DataFrame(), "T1", "O1", ["C1"], "Q1"),
+        Study(pd.DataFrame(), "T2", "O2", [], "Q2", background_context="Ctx2"),
+    ]
+    prompt = format_batch_generation_prompt(studies)
+    assert "[1] question: Q1" in prompt
+    assert "[2] question: Q2" in prompt
+    assert "C1" in prompt
+    assert "Ctx2" in prompt
+
+
+def test_adapter_bounds_calls_with_settings(mocker):
+    completion = mocker.patch("litellm.completion")
+    completion.return_value.choices[0].message.content = "{}"
+    settings = ConfounderSettings(llm_timeout=5.0, llm_max_output_tokens=256)
+
+    assert LLMAdapter(settings).complete("hi") == "{}"
+
+    kwargs = completion.call_args.kwargs
+    assert kwargs["timeout"] == 5.0
+    assert kwargs["max_tokens"] == 256
+
+
+def test_adapter_jittered_backoff_within_total_timeout(mocker):
+    mocker.patch("litellm.completion", side_effect=RuntimeError("rate limited"))
+    sleep = mocker.patch("confounder.llm.adapter.time.sleep")
+    adapter = LLMAdapter(ConfounderSettings(llm_max_retries=4, llm_timeout=1.0))
+
+    with pytest.raises(ConfounderProviderError):
+        adapter.complete("hi")
+
+    waits = [call.args[0] for call in sleep.call_args_list]
+    assert len(waits) == 3
+    assert all(0.0 <= w <= 0.5 * 2 ** n for n, w in enumerate(waits, start=1))
+    assert adapter.total_timeout == 4 * 1.0 + (1.0 + 2.0 + 4.0)
+
+
+def test_adapter_complete_many_overlaps_calls(mocker):
+    in_flight = 0
+    peak = 0
+
+    async def _reply(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        response = mocker.MagicMock()
+        response.choices[0].message.content = kwargs["messages"][-1]["content"].upper()
+        return response
+
+    mocker.patch("litellm.acompletion", side_effect=_reply)
+
+    replies = LLMAdapter(ConfounderSettings()).complete_many(["a", "b", "c"], system="sys")
+
+    assert replies == ["A", "B", "C"]
+    assert peak == 3
+
+
+def test_adapter_cache_skips_repeat_calls(mocker, tmp_path):
+    completion = mocker.patch("litellm.completion")
+    completion.return_value.choices[0].message.content = '{"candidates": []}'
+    settings = ConfounderSettings(
+        llm_cache_enabled=True,
+        llm_cache_path=str(tmp_path / "llm.sqlite"),
+    )
+
+    first = LLMAdapter(settings).complete("prompt", system="sys")
+    second = LLMAdapter(settings).complete("prompt", system="sys")
+    LLMAdapter(settings).complete("other prompt", system="sys")
+
+    assert first == second == '{"candidates": []}'
+    assert completion.call_count == 2
+
+
+def test_adapter_cache_respects_temperature_and_opt_out(mocker, tmp_path):
+    completion = mocker.patch("litellm.completion")
+    completion.return_value.choices[0].message.content = '{"candidates": []}'
+    adapter = LLMAdapter(ConfounderSettings(
+        llm_cache_enabled=True,
+        llm_cache_path=str(tmp_path / "llm.sqlite"),
+    ))
+
+    adapter.complete("prompt", temperature=0.0)
+    adapter.complete("prompt", temperature=0.0)
+    assert completion.call_count == 1
+
+    adapter.complete("prompt", temperature=1.0)
+    assert completion.call_count == 2
+
+    adapter.complete("prompt", temperature=0.0, use_cache=False)
+    assert completion.call_count == 3
+
+
+def test_adapter_cache_only_stores_validated_responses(mocker, tmp_path):
+    completion = mocker.patch("litellm.completion")
+    completion.return_value.choices[0].message.content = "{ not json }"
+    settings = ConfounderSettings(
+        llm_cache_enabled=True,
+        llm_cache_path=str(tmp_path / "llm.sqlite"),
+    )
+
+    for _ in range(2):
+        LLMAdapter(settings).complete("prompt", validate=parse_candidates)
+
+    assert completion.call_count == 2
+
+
+def test_adapter_cache_failures_do_not_fail_the_call(mocker, tmp_path):
+    completion = mocker.patch("litellm.completion")
+    completion.return_value.choices[0].message.content = '{"candidates": []}'
+    acompletion = mocker.patch("litellm.acompletion", new=mocker.AsyncMock())
+    acompletion.return_value.choices[0].message.content = '{"candidates": []}'
+    adapter = LLMAdapter(ConfounderSettings(
+        llm_cache_enabled=True,
+        llm_cache_path=str(tmp_path / "llm.sqlite"),
+    ))
+    locked = sqlite3.OperationalError("database is locked")
+    mocker.patch.object(adapter._cache, "get", side_effect=locked)
+    mocker.patch.object(adapter._cache, "set", side_effect=locked)
+
+    assert adapter.complete("prompt") == '{"candidates": []}'
+    assert asyncio.run(adapter.acomplete("prompt")) == '{"candidates": []}'
+    assert completion.call_count == acompletion.await_count == 1
+
+
+def test_semantic_cache_falls_back_when_encoder_fails_to_load(mocker, tmp_path):
+    fake_module = mocker.MagicMock()
+    fake_module.SentenceTransformer.side_effect = OSError("model download failed")
+    mocker.patch.dict("sys.modules", {"sentence_transformers": fake_module})
+
+    cache = GenerativeCache(tmp_path / "llm.sqlite", semantic=True)
+    cache.set("key", "reply", model="m", query="question", context="ctx")
+
+    assert cache.get("key", model="m") == "reply"
+    assert cache.get("other", model="m", query="question", context="ctx") is None
+
+
+def test_adapter_reuses_one_cache_per_config(tmp_path):
+    settings = ConfounderSettings(
+        llm_cache_enabled=True,
+        llm_cache_path=str(tmp_path / "llm.sqlite"),
+    )
+    assert LLMAdapter(settings)._cache is LLMAdapter(settings)._cache
+
+
+def test_adapter_async_cache_hit(mocker, tmp_path):
+    acompletion = mocker.patch("litellm.acompletion", new=mocker.AsyncMock())
+    acompletion.return_value.choices[0].message.content = '{"candidates": []}'
+    settings = ConfounderSettings(
+        llm_cache_enabled=True,
+        llm_cache_path=str(tmp_path / "llm.sqlite"),
+    )
+
+    async def _twice():
+        adapter = LLMAdapter(settings)
+        return [await adapter.acomplete("prompt", validate=parse_candidates) for _ in range(2)]
+
+    assert asyncio.run(_twice()) == ['{"candidates": []}'] * 2
+    assert acompletion.await_count == 1
+
+
+class _LetterCountEncoder:
+    """Stand-in for sentence-transformers: case and punctuation do not change the vector."""
+
+    def encode(self, text):
+        return [text.lower().count(ch) for ch in "abcdefghijklmnopqrstuvwxyz"]
+
+
+@pytest.fixture
+def semantic_settings(monkeypatch, tmp_path):
+    def _load_encoder(self):
+        self._encoder = _LetterCountEncoder()
+        return True
+
+    monkeypatch.setattr(GenerativeCache, "_load_encoder", _load_encoder)
+    return ConfounderSettings(
+        llm_cache_enabled=True,
+        llm_cache_semantic=True,
+        llm_cache_path=str(tmp_path / "llm.sqlite"),
+    )
+
+
+def test_adapter_semantic_cache_is_scoped_to_study(mocker, semantic_settings):
+    completion = mocker.patch("litellm.completion")
+    completion.return_value.choices[0].message.content = '{"candidates": []}'
+    adapter = LLMAdapter(semantic_settings)
+
+    def ask(question, treatment):
+        prompt = format_generation_prompt(question, treatment, "score", ["age"], None)
+        return adapter.complete(prompt, system="sys", cache_query=question)
+
+    ask("Does tutoring improve test scores?", "tutoring")
+    # Rephrased question, same study: served from the semantic cache
+    ask("does tutoring improve test scores", "tutoring")
+    assert completion.call_count == 1
+
+    # Same question over different data must not reuse the reply
+    ask("Does tutoring improve test scores?", "tutored")
+    assert completion.call_count == 2
+
+
+def test_adapter_semantic_cache_respects_temperature(mocker, semantic_settings):
+    completion = mocker.patch("litellm.completion")
+    completion.return_value.choices[0].message.content = '{"candidates": []}'
+    adapter = LLMAdapter(semantic_settings)
+    question = "Does tutoring improve test scores?"
+    prompt = format_generation_prompt(question, "tutoring", "score", ["age"], None)
+
+    adapter.complete(prompt, temperature=0.0, cache_query=question)
+    adapter.complete(prompt, temperature=1.0, cache_query=question)
+    assert completion.call_count == 2
+
+    adapter.complete(prompt, temperature=1.0, cache_query=question.lower())
+    assert completion.call_count == 2
+
+
+@pytest.mark.parametrize(
+    ("provider", "model", "expected"),
+    [
+        (LLMProvider.OLLAMA, "", "ollama/llama3.1"),
+        (LLMProvider.OLLAMA, "ollama/mistral", "ollama/mistral"),
+        (LLMProvider.OPENAI, "", "gpt-4o"),
+        (LLMProvider.GROQ, "mixtral", "mixtral"),
+    ],
+)
+def test_resolved_model(provider, model, expected):
+    assert ConfounderSettings(llm_provider=provider, llm_model=model).resolved_model == expected
+
+
+def test_resolved_model_follows_copies_and_assignment():
+    settings = ConfounderSettings(llm_provider=LLMProvider.OLLAMA, llm_model="")
+    assert settings.resolved_model == "ollama/llama3.1"
+
+    copied = settings.model_copy(update={"llm_provider": LLMProvider.OPENAI})
+    assert copied.resolved_model == "gpt-4o"
+    assert LLMAdapter(copied).provider_info["model"] == "gpt-4o"
+
+    settings.llm_model = "mistral"
+    assert settings.resolved_model == "ollama/mistral"